@@ -7,4 +7,7 @@ rmdir /S /Q dist
 echo Building the project...
 pyinstaller pyinstaller\LearnAnalogClocks.spec
 
+echo Checking the startup budget...
+python src\benchmark.py startup --executable dist\LearnAnalogClocks\LearnAnalogClocks.exe
+
 pause
@@ -0,0 +1,12 @@
+#!/bin/sh
+set -e
+cd "$(dirname "$0")"
+
+echo "Cleaning up old build artifacts..."
+rm -rf build dist
+
+echo "Building the project..."
+pyinstaller pyinstaller/LearnAnalogClocks.spec
+
+echo "Checking the startup budget..."
+python src/benchmark.py startup --executable dist/LearnAnalogClocks/LearnAnalogClocks
@@ -1,34 +1,113 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+
+SRC = os.path.join(SPECPATH, '..', 'src')
+
+# Qt modules the app never imports. QtSvg stays for worksheet export.
+QT_EXCLUDES = [
+    'PyQt6.QtBluetooth',
+    'PyQt6.QtDBus',
+    'PyQt6.QtDesigner',
+    'PyQt6.QtHelp',
+    'PyQt6.QtMultimedia',
+    'PyQt6.QtMultimediaWidgets',
+    'PyQt6.QtNetwork',
+    'PyQt6.QtNfc',
+    'PyQt6.QtOpenGL',
+    'PyQt6.QtOpenGLWidgets',
+    'PyQt6.QtPdf',
+    'PyQt6.QtPdfWidgets',
+    'PyQt6.QtPositioning',
+    'PyQt6.QtPrintSupport',
+    'PyQt6.QtQml',
+    'PyQt6.QtQuick',
+    'PyQt6.QtQuick3D',
+    'PyQt6.QtQuickWidgets',
+    'PyQt6.QtRemoteObjects',
+    'PyQt6.QtSensors',
+    'PyQt6.QtSerialPort',
+    'PyQt6.QtSpatialAudio',
+    'PyQt6.QtSql',
+    'PyQt6.QtSvgWidgets',
+    'PyQt6.QtTest',
+    'PyQt6.QtTextToSpeech',
+    'PyQt6.QtWebChannel',
+    'PyQt6.QtWebSockets',
+    'PyQt6.QtXml',
+]
+
+# Only the desktop app is packaged, not the command line tools.
+PYTHON_EXCLUDES = [
+    'asyncio',
+    'concurrent',
+    'pydoc',
+    'tkinter',
+    'tracemalloc',
+    'unittest',
+]
+
+# Qt plugin directories nothing in the app loads.
+QT_PLUGIN_EXCLUDES = {
+    'multimedia',
+    'networkinformation',
+    'position',
+    'printsupport',
+    'qmltooling',
+    'sensors',
+    'sqldrivers',
+    'tls',
+}
+
+
+def is_unused_qt_file(dest_name):
+    parts = dest_name.replace('\\', '/').split('/')
+
+    if 'translations' in parts:
+        return True
+
+    # Only loaded by the PDF image format plugin, which is dropped below.
+    if 'Qt6Pdf' in parts[-1]:
+        return True
+
+    if 'plugins' in parts:
+        plugin_dir = parts[parts.index('plugins') + 1]
+        if plugin_dir in QT_PLUGIN_EXCLUDES:
+            return True
+        if plugin_dir == 'imageformats':
+            return 'svg' not in parts[-1] and 'ico' not in parts[-1]
+
+    return False
 
 
 a = Analysis(
-    ['..\\src\\clock.py'],
-    pathex=['src'],
+    [os.path.join(SRC, 'clock.py')],
+    pathex=[SRC],
     binaries=[],
     datas=[],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=QT_EXCLUDES + PYTHON_EXCLUDES,
     noarchive=False,
     optimize=0,
 )
+a.binaries = [entry for entry in a.binaries if not is_unused_qt_file(entry[0])]
+a.datas = [entry for entry in a.datas if not is_unused_qt_file(entry[0])]
 pyz = PYZ(a.pure)
 
+# One-dir build: a one-file executable unpacks the whole bundle to a
+# temporary directory on every launch, and UPX adds decompression on top.
 exe = EXE(
     pyz,
     a.scripts,
-    a.binaries,
-    a.datas,
     [],
+    exclude_binaries=True,
     name='LearnAnalogClocks',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
-    upx_exclude=[],
-    runtime_tmpdir=None,
+    upx=False,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -36,3 +115,12 @@ exe = EXE(
     codesign_identity=None,
     entitlements_file=None,
 )
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='LearnAnalogClocks',
+)
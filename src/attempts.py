@@ -0,0 +1,244 @@
+from dataclasses import astuple, dataclass, fields
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from clocktime import ClockTime
+from model import Answer
+
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 2.0
+
+STAT_DIMENSIONS = ("hour", "minute", "precision")
+
+
+@dataclass(frozen=True)
+class Attempt:
+    learner: str
+    timestamp: float
+    target_minute_of_day: int
+    hours_input: str
+    minutes_input: str
+    hours_correct: bool
+    minutes_correct: bool
+    answer_seconds: float
+    show_hour_marks: bool
+    show_minute_marks: bool
+    hours_text_interval: int
+    minutes_text_interval: int
+    round_minutes_to_nearest: int
+
+    @classmethod
+    def create(cls,
+               learner: str,
+               target: ClockTime,
+               hours_input: str,
+               minutes_input: str,
+               answer: Answer,
+               answer_seconds: float,
+               settings: dict[str, int | bool]) -> "Attempt":
+        return cls(
+            learner=learner,
+            timestamp=time.time(),
+            target_minute_of_day=target.minute_of_day(),
+            hours_input=hours_input,
+            minutes_input=minutes_input,
+            hours_correct=answer.hours_correct,
+            minutes_correct=answer.minutes_correct,
+            answer_seconds=answer_seconds,
+            show_hour_marks=settings["show_hour_marks"],
+            show_minute_marks=settings["show_minute_marks"],
+            hours_text_interval=settings["hours_text_interval"],
+            minutes_text_interval=settings["minutes_text_interval"],
+            round_minutes_to_nearest=settings["round_minutes_to_nearest"],
+        )
+
+    def correct(self) -> bool:
+        return self.hours_correct and self.minutes_correct
+
+    def stat_keys(self) -> list[tuple[str, int]]:
+        target = ClockTime.from_minutes(self.target_minute_of_day)
+        return [
+            ("hour", target.hour12()),
+            ("minute", target.minute()),
+            ("precision", self.round_minutes_to_nearest),
+        ]
+
+
+@dataclass
+class Tally:
+    attempts: int = 0
+    correct: int = 0
+
+    def accuracy(self) -> float:
+        return self.correct / self.attempts if self.attempts else 0.0
+
+
+class AttemptStats:
+    def __init__(self):
+        self._tallies: dict[str, dict[int, Tally]] = {
+            dimension: {} for dimension in STAT_DIMENSIONS
+        }
+
+    def add(self, dimension: str, key: int, attempts: int, correct: int):
+        tally = self._tallies[dimension].setdefault(key, Tally())
+        tally.attempts += attempts
+        tally.correct += correct
+
+    def add_attempt(self, attempt: Attempt):
+        for dimension, key in attempt.stat_keys():
+            self.add(dimension, key, 1, int(attempt.correct()))
+
+    def by_hour(self) -> dict[int, Tally]:
+        return dict(self._tallies["hour"])
+
+    def by_minute(self) -> dict[int, Tally]:
+        return dict(self._tallies["minute"])
+
+    def by_precision(self) -> dict[int, Tally]:
+        return dict(self._tallies["precision"])
+
+
+class AttemptLog:
+    def __init__(self,
+                 path: Path,
+                 learner: str = "default",
+                 batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL):
+        self._path = Path(path)
+        self._learner = learner
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: queue.Queue[Attempt | None] = queue.Queue()
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        connection = self._connect()
+        self._create_schema(connection)
+        self.stats = self._load_stats(connection, learner)
+        connection.close()
+        # Learners other than the log's own, e.g. classroom clients, are
+        # loaded when they first record.
+        self._learner_stats = {learner: self.stats}
+
+        self._writer = threading.Thread(
+            target=self._write_loop, name="attempt-log", daemon=True
+        )
+        self._writer.start()
+
+    def learner(self) -> str:
+        return self._learner
+
+    def stats_for(self, learner: str) -> AttemptStats:
+        stats = self._learner_stats.get(learner)
+
+        if stats is None:
+            connection = self._connect()
+            try:
+                stats = self._load_stats(connection, learner)
+            finally:
+                connection.close()
+            self._learner_stats[learner] = stats
+
+        return stats
+
+    def record(self, attempt: Attempt):
+        self.stats_for(attempt.learner).add_attempt(attempt)
+        self._queue.put(attempt)
+
+    def close(self):
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self._path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _create_schema(self, connection: sqlite3.Connection):
+        columns = ", ".join(field.name for field in fields(Attempt))
+        with connection:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS attempts ({columns})"
+            )
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS stats ("
+                "learner, dimension, key, attempts, correct, "
+                "PRIMARY KEY (learner, dimension, key))"
+            )
+
+    def _load_stats(self,
+                    connection: sqlite3.Connection,
+                    learner: str) -> AttemptStats:
+        stats = AttemptStats()
+        rows = connection.execute(
+            "SELECT dimension, key, attempts, correct FROM stats "
+            "WHERE learner = ?",
+            (learner,)
+        )
+
+        for dimension, key, attempts, correct in rows:
+            stats.add(dimension, key, attempts, correct)
+
+        return stats
+
+    def _write_loop(self):
+        connection = self._connect()
+        closing = False
+
+        while not closing:
+            attempt = self._queue.get()
+            if attempt is None:
+                break
+
+            batch = [attempt]
+            deadline = time.monotonic() + self._flush_interval
+
+            while len(batch) < self._batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                try:
+                    attempt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+                if attempt is None:
+                    closing = True
+                    break
+
+                batch.append(attempt)
+
+            self._write(connection, batch)
+
+        connection.close()
+
+    def _write(self, connection: sqlite3.Connection, batch: list[Attempt]):
+        placeholders = ", ".join("?" for _ in fields(Attempt))
+        tallies: dict[tuple, list[int]] = {}
+
+        for attempt in batch:
+            for dimension, key in attempt.stat_keys():
+                tally = tallies.setdefault(
+                    (attempt.learner, dimension, key), [0, 0]
+                )
+                tally[0] += 1
+                tally[1] += int(attempt.correct())
+
+        with connection:
+            connection.executemany(
+                f"INSERT INTO attempts VALUES ({placeholders})",
+                [astuple(attempt) for attempt in batch]
+            )
+            connection.executemany(
+                "INSERT INTO stats VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (learner, dimension, key) DO UPDATE SET "
+                "attempts = attempts + excluded.attempts, "
+                "correct = correct + excluded.correct",
+                [(*key, attempts, correct)
+                 for key, (attempts, correct) in tallies.items()]
+            )
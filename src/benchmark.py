@@ -0,0 +1,386 @@
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from memory import current_rss_kib, peak_rss_kib
+
+SIZES = (200, 400, 800, 1600)
+DPRS = (1.0, 2.0)
+CONTROLLER_REPEATS = 200
+SETTINGS_REPEATS = 2000
+# Growth a handler may show over all its repeats before it counts as a
+# leak. Qt and Python caches warm up by a fixed amount; a real leak grows
+# with the repeat count.
+LEAK_BLOCKS = 256
+LEAK_BLOCKS_PER_REPEAT = 0.1
+LEAK_RSS_KIB = 4096
+STARTUP_RUNS = 10
+STARTUP_BUDGET_MS = 1000
+
+
+def settings_combinations() -> list[dict]:
+    combinations = []
+
+    for hour_marks, minute_marks, hours_text, minutes_text in itertools.product(
+        (True, False), (True, False), (0, 1, 3, 6), (0, 5, 15, 30)
+    ):
+        if minute_marks and not hour_marks:
+            continue
+
+        combinations.append({
+            "show_hour_marks": hour_marks,
+            "show_minute_marks": minute_marks,
+            "hours_text_interval": hours_text,
+            "minutes_text_interval": minutes_text,
+        })
+
+    return combinations
+
+
+def summarize(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": ordered[int(0.95 * (len(ordered) - 1))] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def measure(action: Callable[[], object], repeats: int) -> list[float]:
+    samples = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        action()
+        samples.append(time.perf_counter() - start)
+
+    return samples
+
+
+def measure_memory(action: Callable[[], object], repeats: int) -> dict:
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    rss_before = current_rss_kib()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    for _ in range(repeats):
+        action()
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+
+    rss_after = current_rss_kib()
+
+    return {
+        "repeats": repeats,
+        "peak_traced_kib": peak / 1024,
+        "allocated_blocks_delta": sys.getallocatedblocks() - blocks_before,
+        "rss_delta_kib": (rss_after - rss_before
+                          if rss_before is not None and rss_after is not None
+                          else None),
+    }
+
+
+def run_worker(args: argparse.Namespace) -> dict:
+    from PyQt6.QtCore import QObject, QTime
+    from PyQt6.QtWidgets import QApplication
+
+    app = QApplication.instance() or QApplication([])
+
+    from controller import Controller
+    from model import Model
+    from view import AnalogClock, AnalogClockSettings, MainWindow
+
+    results = {"paint": [], "controller": {}}
+    times = [QTime(hour, minute) for hour in range(1, 13)
+             for minute in range(0, 60, 7)]
+    time_cycle = itertools.cycle(times)
+
+    clock = AnalogClock(QTime(3, 0))
+    clock.show()
+
+    for size in args.sizes:
+        clock.resize(size, size)
+        app.processEvents()
+
+        for combination in settings_combinations():
+            settings = AnalogClockSettings()
+            for name, value in combination.items():
+                setattr(settings, name, value)
+
+            def face_frame():
+                # set_settings skips unchanged settings, so drop the cached
+                # layers to time a full face render on every frame.
+                clock._layers.clear()
+                clock.set_settings(settings)
+                clock.repaint()
+
+            def hands_frame():
+                clock.set_time(next(time_cycle))
+                app.processEvents()
+
+            results["paint"].append({
+                "size": size,
+                "settings": combination,
+                "face": summarize(measure(face_frame, args.frames)),
+                "hands": summarize(measure(hands_frame, args.frames)),
+            })
+
+    clock.close()
+
+    window = MainWindow()
+    controller = Controller(Model(), window)
+    window.show()
+    app.processEvents()
+
+    def update_time():
+        controller._update_time()
+        app.processEvents()
+
+    def check_input():
+        controller._check_input()
+        app.processEvents()
+
+    def open_and_save_settings():
+        controller._open_settings()
+        controller._settings_window.set_button.click()
+        app.processEvents()
+
+    handlers = {
+        "_update_time": (update_time, CONTROLLER_REPEATS),
+        "_check_input": (check_input, CONTROLLER_REPEATS),
+        "_open_settings+_save_settings": (
+            open_and_save_settings, SETTINGS_REPEATS
+        ),
+    }
+
+    for name, (action, repeats) in handlers.items():
+        # Warm up once so lazily built widgets are not counted as growth.
+        action()
+        qobjects_before = len(window.findChildren(QObject))
+        results["controller"][name] = {
+            **summarize(measure(action, repeats)),
+            **measure_memory(action, repeats),
+            "qobjects_delta": (
+                len(window.findChildren(QObject)) - qobjects_before
+            ),
+        }
+
+    window.close()
+    results["peak_rss_kib"] = peak_rss_kib()
+    return results
+
+
+def run(args: argparse.Namespace) -> dict:
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "frames": args.frames,
+        "runs": {},
+    }
+
+    for dpr in args.dprs:
+        environment = dict(os.environ)
+        environment["QT_QPA_PLATFORM"] = "offscreen"
+        environment["QT_SCALE_FACTOR"] = f"{dpr:g}"
+        command = [
+            sys.executable, __file__, "worker",
+            "--frames", str(args.frames),
+            "--sizes", *map(str, args.sizes),
+        ]
+        output = subprocess.run(command, env=environment, check=True,
+                                capture_output=True, text=True).stdout
+        report["runs"][f"{dpr:g}"] = json.loads(output)
+
+    return report
+
+
+def run_startup(args: argparse.Namespace) -> dict:
+    if args.executable:
+        command = [str(args.executable)]
+    else:
+        command = [sys.executable, str(Path(__file__).with_name("clock.py"))]
+
+    command.append("--exit-after-first-paint")
+    samples = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        environment = dict(os.environ)
+        # Keep attempts and schedules of the runs out of the user's data.
+        environment["XDG_DATA_HOME"] = directory
+
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            subprocess.run(command, env=environment, check=True, timeout=60)
+            samples.append(time.perf_counter() - start)
+
+    return {
+        "command": command,
+        "budget_ms": args.budget_ms,
+        "first_ms": samples[0] * 1000,
+        **summarize(samples),
+    }
+
+
+def flatten(report: dict) -> dict[str, float]:
+    medians = {}
+
+    for dpr, run in report["runs"].items():
+        for case in run["paint"]:
+            settings = ",".join(
+                f"{name}={value}" for name, value in case["settings"].items()
+            )
+            prefix = f"paint[dpr={dpr},size={case['size']},{settings}]"
+            medians[f"{prefix}.face"] = case["face"]["median_ms"]
+            medians[f"{prefix}.hands"] = case["hands"]["median_ms"]
+
+        for name, result in run["controller"].items():
+            medians[f"controller[dpr={dpr}].{name}"] = result["median_ms"]
+
+    return medians
+
+
+def leaks(report: dict) -> list[str]:
+    found = []
+
+    for dpr, run in report["runs"].items():
+        for name, result in run["controller"].items():
+            prefix = f"controller[dpr={dpr}].{name}"
+            blocks = result["allocated_blocks_delta"]
+            rss = result["rss_delta_kib"]
+
+            if result["qobjects_delta"] > 0:
+                found.append(
+                    f"{prefix}: {result['qobjects_delta']} QObjects leaked"
+                )
+
+            allowed = LEAK_BLOCKS + result["repeats"] * LEAK_BLOCKS_PER_REPEAT
+
+            if blocks > allowed:
+                found.append(
+                    f"{prefix}: {blocks} allocated blocks over "
+                    f"{result['repeats']} repeats"
+                )
+
+            if rss is not None and rss > LEAK_RSS_KIB:
+                found.append(f"{prefix}: RSS grew by {rss:.0f} KiB")
+
+    return found
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    old = flatten(baseline)
+    new = flatten(current)
+    regressions = []
+
+    for name in sorted(old.keys() & new.keys()):
+        if old[name] > 0 and new[name] > old[name] * (1 + threshold):
+            change = (new[name] / old[name] - 1) * 100
+            regressions.append(
+                f"{name}: {old[name]:.3f}ms -> {new[name]:.3f}ms "
+                f"(+{change:.0f}%)"
+            )
+
+    return regressions
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark clock painting and controller handlers."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("-o", "--output", type=Path)
+    run_parser.add_argument("--frames", type=int, default=20)
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    run_parser.add_argument("--dprs", type=float, nargs="+", default=DPRS)
+
+    worker_parser = commands.add_parser("worker")
+    worker_parser.add_argument("--frames", type=int, default=20)
+    worker_parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+
+    compare_parser = commands.add_parser(
+        "compare", help="fail when results regress against a baseline"
+    )
+    compare_parser.add_argument("baseline", type=Path)
+    compare_parser.add_argument("current", type=Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="allowed slowdown of each median")
+
+    startup_parser = commands.add_parser(
+        "startup", help="fail when time to first paint exceeds a budget"
+    )
+    startup_parser.add_argument("--executable", type=Path,
+                                help="packaged app, by default src/clock.py")
+    startup_parser.add_argument("--runs", type=int, default=STARTUP_RUNS)
+    startup_parser.add_argument("--budget-ms", type=float,
+                                default=STARTUP_BUDGET_MS,
+                                help="allowed median time to first paint")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+
+    if args.command == "worker":
+        json.dump(run_worker(args), sys.stdout)
+        return 0
+
+    if args.command == "compare":
+        baseline = json.loads(args.baseline.read_text())
+        current = json.loads(args.current.read_text())
+        regressions = compare(baseline, current, args.threshold)
+        regressions += leaks(current)
+
+        for line in regressions:
+            print(line)
+
+        print(f"{len(regressions)} regressions")
+        return 1 if regressions else 0
+
+    if args.command == "startup":
+        report = run_startup(args)
+        print(json.dumps(report, indent=2))
+
+        if report["median_ms"] > args.budget_ms:
+            print(f"Median time to first paint {report['median_ms']:.0f}ms "
+                  f"exceeds the budget of {args.budget_ms:.0f}ms")
+            return 1
+
+        return 0
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+
+    if args.output:
+        args.output.write_text(text)
+    else:
+        print(text)
+
+    found = leaks(report)
+
+    for line in found:
+        print(line, file=sys.stderr)
+
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
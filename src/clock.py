@@ -1,15 +1,105 @@
+import argparse
+import os
+import re
 import sys
+from pathlib import Path
 
-from view import MainWindow
+from view import AnalogClock, MainWindow
 from model import Model
 from controller import Controller
+from attempts import AttemptLog
+from scheduler import SpacedScheduler
 
+from PyQt6.QtCore import QEvent, QObject, QStandardPaths, QTimer
 from PyQt6.QtWidgets import QApplication
 
+TRACE_VARIABLE = "LAC_TRACE"
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Learn analog clocks.")
+    parser.add_argument("--seed", type=int,
+                        help="seed for a reproducible sequence of times; "
+                             "the learner's spaced schedule is not used")
+    parser.add_argument("--learner", default="default",
+                        help="name under which attempts are recorded")
+    parser.add_argument("--trace", nargs="?", type=Path,
+                        const=Path("trace.json"),
+                        help="record a Chrome trace and write it on exit, "
+                             f"also enabled by {TRACE_VARIABLE}=1")
+    parser.add_argument("--trace-overlay", action="store_true",
+                        help="show frame time percentiles while tracing")
+    parser.add_argument("--record", type=Path,
+                        help="record the session to an event file that "
+                             "replay.py can play back")
+    parser.add_argument("--exit-after-first-paint", action="store_true",
+                        help="quit once the clock is painted, to benchmark "
+                             "startup")
+    args, _ = parser.parse_known_args(argv)
+    return args
+
+
+def data_path(name: str) -> Path:
+    data_dir = QStandardPaths.writableLocation(
+        QStandardPaths.StandardLocation.AppDataLocation
+    )
+    return Path(data_dir) / name
+
+
+def schedule_path(learner: str) -> Path:
+    file_name = re.sub(r"[^\w-]", "_", learner)
+    return data_path(f"schedule-{file_name}.bin")
+
+
+class FirstPaintExit(QObject):
+    def eventFilter(self, a0, a1):
+        if a1.type() == QEvent.Type.Paint and isinstance(a0, AnalogClock):
+            # Leave once the paint event is done, skipping the saving on quit.
+            QTimer.singleShot(0, lambda: os._exit(0))
+
+        return False
+
+
 if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
     app = QApplication(sys.argv)
-    model = Model()
+    app.setApplicationName("LearnAnalogClocks")
+
+    if args.trace is None and os.environ.get(TRACE_VARIABLE, "0") != "0":
+        args.trace = Path("trace.json")
+
+    if args.trace is not None:
+        import tracing
+        tracer = tracing.install(app)
+        app.aboutToQuit.connect(lambda: tracer.dump(args.trace))
+
+    attempts = AttemptLog(data_path("attempts.sqlite3"), args.learner)
+    app.aboutToQuit.connect(attempts.close)
+    scheduler = None
+
+    # A seeded sequence must not depend on the saved schedule.
+    if args.seed is None:
+        scheduler = SpacedScheduler.load(schedule_path(args.learner))
+        app.aboutToQuit.connect(
+            lambda: scheduler.save(schedule_path(args.learner))
+        )
+
+    model = Model(args.seed, scheduler)
     view = MainWindow()
-    controller = Controller(model, view)
+
+    if args.record is not None:
+        from replay import Recorder
+        recorder = Recorder(args.record, view, model)
+        app.aboutToQuit.connect(recorder.close)
+
+    controller = Controller(model, view, attempts)
+
+    if args.trace is not None and args.trace_overlay:
+        overlay = tracing.FrameTimeOverlay(tracer, view)
+
+    if args.exit_after_first_paint:
+        first_paint_exit = FirstPaintExit(app)
+        app.installEventFilter(first_paint_exit)
+
     controller.show_main_window()
     sys.exit(app.exec())
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_DIAL = 12 * 60
+
+
+class ClockTime:
+    __slots__ = ("_minutes", "_second")
+
+    def __init__(self, hour: int, minute: int, second: int = 0):
+        if not (0 <= hour <= 23 and 0 <= minute <= 59 and 0 <= second <= 59):
+            raise ValueError(f"Invalid time {hour}:{minute}:{second}")
+
+        self._minutes = hour * 60 + minute
+        self._second = second
+
+    @classmethod
+    def from_minutes(cls, minute_of_day: int, second: int = 0) -> "ClockTime":
+        hour, minute = divmod(minute_of_day % MINUTES_PER_DAY, 60)
+        return cls(hour, minute, second)
+
+    @classmethod
+    def now(cls) -> "ClockTime":
+        now = datetime.now()
+        return cls(now.hour, now.minute, now.second)
+
+    def hour(self) -> int:
+        return self._minutes // 60
+
+    def minute(self) -> int:
+        return self._minutes % 60
+
+    def second(self) -> int:
+        return self._second
+
+    def hour12(self) -> int:
+        return self.hour() % 12 or 12
+
+    def minute_of_day(self) -> int:
+        return self._minutes
+
+    def minute_of_dial(self) -> int:
+        return self._minutes % MINUTES_PER_DIAL
+
+    def rounded_down(self, mins_precision: int) -> "ClockTime":
+        minute = self.minute() // mins_precision * mins_precision
+        return ClockTime(self.hour(), minute)
+
+    def __eq__(self, other):
+        if not isinstance(other, ClockTime):
+            return NotImplemented
+
+        return (self._minutes, self._second) == (other._minutes, other._second)
+
+    def __hash__(self):
+        return hash((self._minutes, self._second))
+
+    def __repr__(self):
+        return f"ClockTime({self.hour()}, {self.minute()}, {self._second})"
+
+    def __str__(self):
+        return f"{self.hour12():02}:{self.minute():02}"
@@ -1,12 +1,63 @@
-from view import MainWindow, SettingsWindow
-from model import Model
+from collections import deque
+from dataclasses import dataclass, field
+import math
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Iterator
+
+from PyQt6.QtCore import Qt, QTime, QTimer
+from PyQt6.QtGui import QPixmap
+from PyQt6.QtWidgets import (
+    QFileDialog,
+    QInputDialog,
+    QMessageBox,
+    QProgressDialog,
+)
+
+from attempts import Attempt, AttemptLog
+from clocktime import ClockTime
+
+from view import (
+    AnalogClockSettings,
+    ClockBoardWindow,
+    MainWindow,
+    SettingsWindow,
+    TimeInput,
+    from_qtime,
+    to_qtime,
+)
+from model import Answer, Model, SettingsChange, check_answer
+from ticker import TickScheduler
+
+DRILL_SECONDS = 60
+# Clocks rendered ahead of the one on screen.
+DRILL_PREFETCH = 3
+FRAME_BUDGET_MS = 16.0
 
 
 class Controller:
-    def __init__(self, model: Model, main_window: MainWindow):
+    def __init__(self,
+                 model: Model,
+                 main_window: MainWindow,
+                 attempts: AttemptLog | None = None):
         self._model = model
         self._main_window = main_window
+        self._attempts = attempts
         self._time = model.get_round_time()
+        self._shown_at = time.monotonic()
+        self._settings_window: SettingsWindow | None = None
+        self._board_controller: ClockBoardController | None = None
+        self._drill: DrillController | None = None
+        self._ticker = TickScheduler(
+            main_window,
+            main_window.analog_minute_hand_length,
+            main_window,
+            main_window.analog_clock_widget()
+        )
+        self._ticker.tick.connect(self._on_live_tick)
+        model.settings.set_scheduler(lambda flush: QTimer.singleShot(0, flush))
+        model.settings.subscribe(self._on_settings_changed)
         self._bind_main_window_buttons()
         self._update_analog_clock_settings()
         self._update_clocks()
@@ -22,9 +73,106 @@ class Controller:
         main.time_input.hours_return_pressed().connect(self._check_input)
         main.time_input.minutes_return_pressed().connect(self._check_input)
         main.settings_button.clicked.connect(self._open_settings)
+        main.live_button.toggled.connect(self._set_live)
+        main.drill_button.toggled.connect(self._set_drill)
+        main.mirror_button.clicked.connect(self._open_mirror)
+        main.board_button.clicked.connect(self._open_board)
+        main.export_button.clicked.connect(self._export)
+
+    def _open_board(self):
+        if self._board_controller is None:
+            self._board_controller = ClockBoardController(
+                self._model, ClockBoardWindow()
+            )
+            self._board_controller.update_settings(
+                self._main_window.get_analog_settings()
+            )
+
+        self._board_controller.show()
+
+    def _open_mirror(self):
+        self._main_window.show_mirror_window()
+
+    def _export(self):
+        main = self._main_window
+        pages, accepted = QInputDialog.getInt(
+            main, "Export", "Number of pages", 1, 1, 1000
+        )
+        if not accepted:
+            return
+
+        file_name, _ = QFileDialog.getSaveFileName(
+            main, "Export worksheet", "worksheet.pdf",
+            "PDF (*.pdf);;SVG, one file per page (*.svg)"
+        )
+        if not file_name:
+            return
+
+        # Imported here to keep QtSvg and the PDF writer off the startup path.
+        from export import (
+            WorksheetLayout,
+            answer_key_path,
+            export_worksheet,
+            model_times,
+        )
+
+        # A separate model keeps the quiz's own sequence of times untouched.
+        export_model = Model()
+        export_model.settings.update(**self._model.settings.values())
+
+        layout = WorksheetLayout()
+        path = Path(file_name)
+        exported_pages = export_worksheet(
+            model_times(export_model, pages * layout.per_page(),
+                        layout.per_page()),
+            path,
+            main.get_analog_settings(),
+            layout,
+            answer_key_path(path)
+        )
+
+        progress = QProgressDialog(
+            "Exporting worksheet...", "Cancel", 0, pages, main
+        )
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+
+        timer = QTimer(progress)
+        timer.timeout.connect(
+            lambda: self._export_next_page(exported_pages, progress, timer)
+        )
+        timer.start(0)
+
+    def _export_next_page(self,
+                          exported_pages: Iterator[int],
+                          progress: QProgressDialog,
+                          timer: QTimer):
+        if progress.wasCanceled():
+            timer.stop()
+            exported_pages.close()
+            progress.deleteLater()
+            return
+
+        page = next(exported_pages, None)
+
+        if page is None:
+            timer.stop()
+            progress.deleteLater()
+            return
+
+        progress.setValue(page)
+
+    def _get_settings_window(self) -> SettingsWindow:
+        if self._settings_window is None:
+            self._settings_window = SettingsWindow(self._main_window)
+            self._settings_window.set_button.clicked.connect(
+                self._save_settings
+            )
+
+        return self._settings_window
 
     def _open_settings(self):
-        self._settings_window = SettingsWindow(self._main_window)
+        self._get_settings_window()
         settings = self._model.settings
 
         self._settings_window.hour_marks_checkbox.setChecked(
@@ -50,31 +198,63 @@ class Controller:
             settings.round_minutes_to_nearest.value
         )
 
-        self._settings_window.set_button.clicked.connect(self._save_settings)
-        self._settings_window.exec()
-
-    def _save_settings(self):
-        settings = self._model.settings
-        window = self._settings_window
-
-        settings.show_minute_marks.checked = \
-            window.minute_marks_checkbox.isChecked()
+        self._settings_window.avoid_repeats_checkbox.setChecked(
+            settings.avoid_repeats.checked
+        )
 
-        settings.show_hour_marks.checked = \
-            window.hour_marks_checkbox.isChecked()
+        self._settings_window.animate_hands_checkbox.setChecked(
+            settings.animate_hands.checked
+        )
 
-        settings.minutes_text_interval.value = \
-            window.get_item(window.minute_text_dropdown).value
+        # Window modal without a nested event loop, so that opening and
+        # saving are separate steps, e.g. for recording and replay.
+        self._settings_window.open()
 
-        settings.hours_text_interval.value = \
-            window.get_item(window.hour_text_dropdown).value
+    def _save_settings(self):
+        window = self._settings_window
 
-        settings.round_minutes_to_nearest.value = \
-            window.get_item(window.round_minutes_dropdown).value
+        self._model.settings.update(
+            show_minute_marks=window.minute_marks_checkbox.isChecked(),
+            show_hour_marks=window.hour_marks_checkbox.isChecked(),
+            minutes_text_interval=window.get_item(
+                window.minute_text_dropdown
+            ).value,
+            hours_text_interval=window.get_item(
+                window.hour_text_dropdown
+            ).value,
+            round_minutes_to_nearest=window.get_item(
+                window.round_minutes_dropdown
+            ).value,
+            avoid_repeats=window.avoid_repeats_checkbox.isChecked(),
+            animate_hands=window.animate_hands_checkbox.isChecked(),
+        )
 
-        self._update_analog_clock_settings()
         window.close()
 
+    def _on_settings_changed(self, change: SettingsChange):
+        if self._drill is not None and change.affects(
+            "show_minute_marks",
+            "show_hour_marks",
+            "minutes_text_interval",
+            "hours_text_interval",
+            "round_minutes_to_nearest",
+            "avoid_repeats",
+        ):
+            self._drill.discard_prefetched()
+
+        if change.affects(
+            "show_minute_marks",
+            "show_hour_marks",
+            "minutes_text_interval",
+            "hours_text_interval",
+        ):
+            self._update_analog_clock_settings()
+
+            if self._board_controller is not None:
+                self._board_controller.update_settings(
+                    self._main_window.get_analog_settings()
+                )
+
     def _update_analog_clock_settings(self):
         model_settings = self._model.settings
         analog_settings = self._main_window.get_analog_settings()
@@ -93,41 +273,319 @@ class Controller:
 
         self._main_window.update_analog_clock_settings(analog_settings)
 
+    def _set_live(self, live: bool):
+        if live:
+            self._main_window.drill_button.setChecked(False)
+            self._main_window.time_input.reset()
+            self._ticker.start()
+
+        else:
+            self._ticker.stop()
+
+    def _on_live_tick(self, tick: QTime):
+        previous = self._time
+        now = from_qtime(tick)
+        self._model.set_time(now)
+        self._time = now
+        self._main_window.update_analog_clock_time(now)
+
+        if now.minute_of_day() != previous.minute_of_day():
+            self._main_window.update_digital_clock_time(now)
+
+    def _set_drill(self, drilling: bool):
+        if not drilling:
+            if self._drill is not None:
+                self._drill.stop()
+                self._drill = None
+
+            return
+
+        self._main_window.live_button.setChecked(False)
+        self._drill = DrillController(
+            self._model, self._main_window, self._on_drill_finished
+        )
+        self._time = self._drill.start()
+        self._shown_at = time.monotonic()
+        self._main_window.update_digital_clock_time(self._time)
+        self._main_window.hide_digital_clock()
+        self._main_window.time_input.reset()
+
+    def _advance_drill(self, started: float):
+        self._time = self._drill.next_time(started)
+        self._shown_at = time.monotonic()
+        self._main_window.update_digital_clock_time(self._time)
+        self._main_window.time_input.reset()
+
+    def _on_drill_finished(self, result: "DrillResult"):
+        self._drill = None
+        self._main_window.drill_button.setChecked(False)
+        QMessageBox.information(
+            self._main_window, "Drill finished", result.summary()
+        )
+
     def _update_time(self):
+        if self._drill is not None:
+            # Skips the current clock.
+            self._advance_drill(time.perf_counter())
+            return
+
+        self._main_window.live_button.setChecked(False)
         self._time = self._model.generate_random_time()
-        self._update_clocks()
+        self._shown_at = time.monotonic()
+        self._update_clocks(self._model.settings.animate_hands.checked)
         self._main_window.hide_digital_clock()
         self._main_window.time_input.reset()
 
     def _show_digital(self):
         self._main_window.show_digital_clock()
 
-    def _update_clocks(self):
-        self._main_window.update_analog_clock_time(self._time)
+    def _update_clocks(self, animate=False):
+        self._main_window.update_analog_clock_time(self._time, animate)
         self._main_window.update_digital_clock_time(self._time)
 
     def _check_input(self):
+        started = time.perf_counter()
         time_input = self._main_window.time_input
-        actual_hours = self._time.hour() % 12
+        hours = time_input.hours()
+        minutes = time_input.minutes()
+        answer = check_answer(self._time, hours, minutes)
+        answer_seconds = time.monotonic() - self._shown_at
+        self._model.record_answer(self._time, answer)
+
+        if self._attempts is not None:
+            self._attempts.record(Attempt.create(
+                learner=self._attempts.learner(),
+                target=self._time,
+                hours_input=hours,
+                minutes_input=minutes,
+                answer=answer,
+                answer_seconds=answer_seconds,
+                settings=self._model.settings.values(),
+            ))
+
+        if (self._drill is not None
+                and answer.hours_correct and answer.minutes_correct):
+            self._drill.record(answer_seconds)
+            self._advance_drill(started)
+            return
+
+        show_answer(time_input, answer)
+
+
+def show_answer(time_input: TimeInput, answer: Answer):
+    if answer.hours_correct:
+        time_input.set_hours_correct()
+
+    else:
+        time_input.set_hours_wrong()
+
+    if answer.minutes_correct:
+        time_input.set_minutes_correct()
+
+    else:
+        time_input.set_minutes_wrong()
+
+
+@dataclass
+class DrillResult:
+    seconds: int
+    answer_seconds: list[float] = field(default_factory=list)
+    advance_ms: list[float] = field(default_factory=list)
+    # Advances that found no rendered clock waiting.
+    misses: int = 0
+
+    def summary(self) -> str:
+        lines = [f"{len(self.answer_seconds)} clocks in {self.seconds} seconds"]
+
+        if self.answer_seconds:
+            lines.append(
+                "Median answer time: "
+                f"{statistics.median(self.answer_seconds):.1f} s"
+            )
+
+        if self.advance_ms:
+            slow = sum(ms > FRAME_BUDGET_MS for ms in self.advance_ms)
+            lines.append(
+                "Next clock shown after: "
+                f"median {statistics.median(self.advance_ms):.1f} ms, "
+                f"max {max(self.advance_ms):.1f} ms, "
+                f"{slow} over {FRAME_BUDGET_MS:g} ms"
+            )
+
+        if self.misses:
+            lines.append(f"Clocks not rendered in time: {self.misses}")
+
+        return "\n".join(lines)
+
+
+class DrillController:
+    """Runs a timed drill that moves on after every correct answer.
+
+    Upcoming clocks are rendered in the background, so moving on only
+    swaps the finished frame onto the screen.
+    """
+
+    def __init__(self,
+                 model: Model,
+                 main_window: MainWindow,
+                 finished: Callable[[DrillResult], None],
+                 seconds: int = DRILL_SECONDS):
+        self._model = model
+        self._main_window = main_window
+        self._finished = finished
+        self._queue: deque[tuple[ClockTime, QPixmap]] = deque()
+        self._requested = 0
+        self._generation = 0
+        self._advance_started: float | None = None
+        self._deadline = 0.0
+        self._running = False
+        self.result = DrillResult(seconds)
+
+        self._timer = QTimer(main_window)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._finish)
+        self._status_timer = QTimer(main_window)
+        self._status_timer.timeout.connect(self._show_status)
+
+    def start(self) -> ClockTime:
+        """Starts the clock and returns the first time to show."""
+        seconds = self.result.seconds
+        self._running = True
+        self._deadline = time.monotonic() + seconds
+        self._timer.start(seconds * 1000)
+        self._status_timer.start(250)
+        self._main_window.analog_clock_painted().connect(self._on_painted)
+        self._show_status()
+
+        first = self._model.generate_times(1)[0]
+        self._main_window.update_analog_clock_time(first)
+        self._prefetch()
+        return first
+
+    def stop(self):
+        if not self._running:
+            return
+
+        self._running = False
+
+        # Parented to the main window, which outlives every drill.
+        for timer in (self._timer, self._status_timer):
+            timer.stop()
+            timer.deleteLater()
+
+        self._main_window.analog_clock_painted().disconnect(self._on_painted)
+        self._main_window.drill_button.setText("Drill")
+        self.discard_prefetched()
+
+    def record(self, answer_seconds: float):
+        self.result.answer_seconds.append(answer_seconds)
+
+    def next_time(self, started: float) -> ClockTime:
+        """Shows the next clock and returns its time.
+
+        started is the time.perf_counter() value the advance is measured
+        from, up to the end of the clock's next paint.
+        """
+        self._advance_started = started
+
+        while self._queue:
+            next_time, frame = self._queue.popleft()
+
+            # Frames from before a resize no longer fit and are dropped.
+            if self._main_window.show_analog_frame(next_time, frame):
+                break
 
-        if actual_hours == 0:
-            actual_hours = 12
+        else:
+            self.result.misses += 1
+            next_time = self._model.generate_times(1)[0]
+            self._main_window.update_analog_clock_time(next_time)
+
+        return next_time
+
+    def discard_prefetched(self):
+        self._generation += 1
+        self._queue.clear()
+        self._requested = 0
+
+        if self._running:
+            self._prefetch()
+
+    def _prefetch(self):
+        missing = DRILL_PREFETCH - len(self._queue) - self._requested
+        if missing <= 0:
+            return
+
+        self._requested += missing
+        generation = self._generation
+        self._main_window.prefetch_analog_frames(
+            self._model.generate_times(missing),
+            lambda frames: self._on_prefetched(generation, missing, frames)
+        )
 
-        if self._is_same(time_input.hours(), actual_hours):
-            time_input.set_hours_correct()
+    def _on_prefetched(self,
+                       generation: int,
+                       requested: int,
+                       frames: list[tuple[ClockTime, QPixmap]]):
+        if generation != self._generation:
+            return
 
-        else:
-            time_input.set_hours_wrong()
+        self._requested -= requested
+        self._queue.extend(frames)
+        self._prefetch()
 
-        if self._is_same(time_input.minutes(), self._time.minute()):
-            time_input.set_minutes_correct()
+    def _on_painted(self):
+        if self._advance_started is None:
+            return
 
-        else:
-            time_input.set_minutes_wrong()
+        self.result.advance_ms.append(
+            (time.perf_counter() - self._advance_started) * 1000
+        )
+        self._advance_started = None
+        # Refilled once the new clock is on screen, so starting the render
+        # jobs is not part of the advance.
+        self._prefetch()
+
+    def _show_status(self):
+        # The button keeps its fixed width, so the countdown never
+        # resizes the clock and invalidates the prefetched frames.
+        remaining = math.ceil(max(0.0, self._deadline - time.monotonic()))
+        self._main_window.drill_button.setText(f"{remaining} s")
+
+    def _finish(self):
+        self.stop()
+        self._finished(self.result)
 
-    def _is_same(self, input_value: str, actual: int) -> bool:
-        if input_value.isnumeric():
-            if actual == int(input_value):
-                return True
 
-        return False
+class ClockBoardController:
+    def __init__(self, model: Model, window: ClockBoardWindow):
+        self._model = model
+        self._window = window
+        self._times: list[ClockTime] = []
+
+        window.new_times_button.clicked.connect(self._new_times)
+        window.count_dropdown.currentIndexChanged.connect(self._new_times)
+        window.board.check_requested.connect(self._check_input)
+        self._new_times()
+
+    def show(self):
+        self._window.show()
+        self._window.raise_()
+
+    def update_settings(self, settings: AnalogClockSettings):
+        self._window.board.set_settings(settings)
+
+    def _new_times(self):
+        board = self._window.board
+        self._times = self._model.generate_times(self._window.clock_count())
+        board.set_times([to_qtime(time) for time in self._times])
+
+        for time_input in board.inputs:
+            time_input.reset()
+
+    def _check_input(self, index: int):
+        time_input = self._window.board.inputs[index]
+        answer = check_answer(
+            self._times[index], time_input.hours(), time_input.minutes()
+        )
+        show_answer(time_input, answer)
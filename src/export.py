@@ -0,0 +1,253 @@
+import argparse
+import itertools
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from PyQt6.QtCore import QMarginsF, QPoint, QRect, QSize, Qt
+from PyQt6.QtGui import (
+    QColor,
+    QFont,
+    QGuiApplication,
+    QPageLayout,
+    QPageSize,
+    QPainter,
+    QPdfWriter,
+)
+from PyQt6.QtSvg import QSvgGenerator
+
+from clocktime import ClockTime
+from model import Model
+from view import AnalogClockSettings, ClockPainter, to_qtime
+
+# Pages are laid out in CSS pixels so fonts match the on-screen clock.
+RESOLUTION = 96
+PAGE_SIZE = QPageSize(QPageSize.PageSizeId.A4)
+MARGIN = 48
+HEADER_HEIGHT = 48
+ANSWER_HEIGHT = 36
+
+
+@dataclass(frozen=True)
+class WorksheetLayout:
+    columns: int = 3
+    rows: int = 4
+    title: str = "What time is it?"
+
+    def per_page(self) -> int:
+        return self.columns * self.rows
+
+
+class PdfTarget:
+    def __init__(self, path: Path):
+        self._writer = QPdfWriter(str(path))
+        self._writer.setResolution(RESOLUTION)
+        self._writer.setPageLayout(QPageLayout(
+            PAGE_SIZE, QPageLayout.Orientation.Portrait, QMarginsF()
+        ))
+        self._painter: QPainter | None = None
+
+    def begin_page(self) -> QPainter:
+        if self._painter is None:
+            self._painter = QPainter(self._writer)
+        else:
+            self._writer.newPage()
+
+        return self._painter
+
+    def end_page(self):
+        pass
+
+    def close(self):
+        if self._painter is not None:
+            self._painter.end()
+
+
+class SvgTarget:
+    def __init__(self, path: Path):
+        self._path = path
+        self._page = 0
+        self._generator: QSvgGenerator | None = None
+        self._painter: QPainter | None = None
+
+    def begin_page(self) -> QPainter:
+        self._page += 1
+        size = PAGE_SIZE.sizePixels(RESOLUTION)
+        self._generator = QSvgGenerator()
+        self._generator.setFileName(str(self._page_path()))
+        self._generator.setResolution(RESOLUTION)
+        self._generator.setSize(size)
+        self._generator.setViewBox(QRect(QPoint(), size))
+        self._painter = QPainter(self._generator)
+        return self._painter
+
+    def end_page(self):
+        self._painter.end()
+        self._painter = None
+        self._generator = None
+
+    def close(self):
+        if self._painter is not None:
+            self.end_page()
+
+    def _page_path(self) -> Path:
+        return self._path.with_name(
+            f"{self._path.stem}-{self._page:03}{self._path.suffix}"
+        )
+
+
+def open_target(path: Path) -> PdfTarget | SvgTarget:
+    if path.suffix.lower() == ".svg":
+        return SvgTarget(path)
+
+    return PdfTarget(path)
+
+
+def answer_key_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}-answers{path.suffix}")
+
+
+def model_times(model: Model, count: int, chunk: int) -> Iterator[ClockTime]:
+    while count > 0:
+        batch = model.generate_times(min(chunk, count))
+        count -= len(batch)
+        yield from batch
+
+
+def paginate(times: Iterable[ClockTime],
+             per_page: int) -> Iterator[list[ClockTime]]:
+    times = iter(times)
+
+    while page := list(itertools.islice(times, per_page)):
+        yield page
+
+
+def paint_page(painter: QPainter,
+               clock_painter: ClockPainter,
+               layout: WorksheetLayout,
+               times: list[ClockTime],
+               page_number: int,
+               answers: bool):
+    page = QRect(QPoint(), PAGE_SIZE.sizePixels(RESOLUTION))
+    content = page.adjusted(MARGIN, MARGIN, -MARGIN, -MARGIN)
+
+    font = QFont(painter.font())
+    font.setPixelSize(20)
+    font.setBold(True)
+    painter.setFont(font)
+    painter.setPen(QColor("black"))
+    header = QRect(content.topLeft(), QSize(content.width(), HEADER_HEIGHT))
+    title = layout.title + (" (answers)" if answers else "")
+    painter.drawText(header, Qt.AlignmentFlag.AlignLeft, title)
+    painter.drawText(header, Qt.AlignmentFlag.AlignRight, str(page_number))
+
+    grid = content.adjusted(0, HEADER_HEIGHT, 0, 0)
+    cell_width = grid.width() // layout.columns
+    cell_height = grid.height() // layout.rows
+
+    for index, time in enumerate(times):
+        row, column = divmod(index, layout.columns)
+        cell = QRect(grid.left() + column * cell_width,
+                     grid.top() + row * cell_height,
+                     cell_width, cell_height)
+        clock_rect = cell.adjusted(0, 0, 0, -ANSWER_HEIGHT)
+        answer_rect = QRect(cell.left(), clock_rect.bottom(),
+                            cell.width(), ANSWER_HEIGHT)
+
+        painter.save()
+        clock_painter.begin(painter, clock_rect, QColor("black"), QFont())
+        clock_painter.draw_face(painter)
+        clock_painter.draw_hands(painter, to_qtime(time))
+        painter.restore()
+
+        painter.setPen(QColor("black"))
+        painter.setFont(font)
+        painter.drawText(answer_rect, Qt.AlignmentFlag.AlignCenter,
+                         str(time) if answers else "____ : ____")
+
+
+def export_worksheet(times: Iterable[ClockTime],
+                     path: Path,
+                     settings: AnalogClockSettings,
+                     layout: WorksheetLayout = WorksheetLayout(),
+                     answer_key: Path | None = None) -> Iterator[int]:
+    clock_painter = ClockPainter(settings)
+    targets = [(open_target(path), False)]
+
+    if answer_key is not None:
+        targets.append((open_target(answer_key), True))
+
+    try:
+        pages = paginate(times, layout.per_page())
+
+        for page_number, page_times in enumerate(pages, start=1):
+            for target, answers in targets:
+                painter = target.begin_page()
+                paint_page(painter, clock_painter, layout, page_times,
+                           page_number, answers)
+                target.end_page()
+
+            yield page_number
+
+    finally:
+        for target, _ in targets:
+            target.close()
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Export clock worksheets to PDF or SVG."
+    )
+    parser.add_argument("output", type=Path,
+                        help="worksheet file, .pdf or .svg (one per page)")
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--columns", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=4)
+    parser.add_argument("--title", default=WorksheetLayout.title)
+    parser.add_argument("--answer-key", action="store_true",
+                        help="also write an answer key next to the output")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--round-minutes", type=int, default=5,
+                        choices=(1, 5, 15, 30))
+    parser.add_argument("--hours-text-interval", type=int, default=1,
+                        choices=(0, 1, 3, 6))
+    parser.add_argument("--minutes-text-interval", type=int, default=5,
+                        choices=(0, 5, 15, 30))
+    parser.add_argument("--no-hour-marks", action="store_true")
+    parser.add_argument("--no-minute-marks", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QGuiApplication([])  # noqa: F841
+
+    model = Model(args.seed)
+    model.settings.update(round_minutes_to_nearest=args.round_minutes)
+
+    settings = AnalogClockSettings()
+    settings.show_hour_marks = not args.no_hour_marks
+    settings.show_minute_marks = not (args.no_minute_marks or
+                                      args.no_hour_marks)
+    settings.hours_text_interval = args.hours_text_interval
+    settings.minutes_text_interval = args.minutes_text_interval
+
+    layout = WorksheetLayout(args.columns, args.rows, args.title)
+    count = args.pages * layout.per_page()
+    answer_key = answer_key_path(args.output) if args.answer_key else None
+
+    for page in export_worksheet(
+        model_times(model, count, layout.per_page()),
+        args.output, settings, layout, answer_key
+    ):
+        print(f"\rPage {page}/{args.pages}", end="", flush=True)
+
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,26 @@
+import os
+import sys
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_rss_kib() -> float | None:
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere.
+    return peak / 1024 if sys.platform == "darwin" else peak
+
+
+def current_rss_kib() -> float | None:
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+    except OSError:
+        return peak_rss_kib()
+
+    return pages * os.sysconf("SC_PAGE_SIZE") / 1024
@@ -1,35 +1,103 @@
 from dataclasses import dataclass
-import math
 import random
+from typing import Callable
 
-from PyQt6.QtCore import QTime
+from clocktime import ClockTime, MINUTES_PER_DIAL
+from scheduler import SpacedScheduler
 
 
 class Model:
-    def __init__(self):
-        self._time = QTime.currentTime()
+    def __init__(self,
+                 seed: int | None = None,
+                 scheduler: SpacedScheduler | None = None):
+        self._time = ClockTime.now()
         self.settings = Settings()
+        self._random = random.Random(seed)
+        self._scheduler = scheduler
+        self._deck: list[int] = []
+        self.settings.subscribe(self._on_settings_changed)
 
-    def get_time(self) -> QTime:
+    def get_time(self) -> ClockTime:
         return self._time
 
-    def get_round_time(self):
+    def get_round_time(self) -> ClockTime:
         precision = self.settings.round_minutes_to_nearest.value
-        return self._round_down(self._time, precision)
-
-    def _round_down(self, time: QTime, mins_precision: int = 5):
-        minute = math.floor(time.minute() / mins_precision) * mins_precision
-        return QTime(time.hour(), minute)
+        return self._time.rounded_down(precision)
 
-    def set_time(self, time: QTime):
+    def set_time(self, time: ClockTime):
         self._time = time
 
-    def generate_random_time(self) -> QTime:
-        hour = random.randint(1, 12)
-        minute = round(random.randint(0, 59))
-        time = QTime(hour, minute)
+    def generate_random_time(self) -> ClockTime:
+        # Dealing without repeats takes precedence over the schedule, which
+        # brings missed times back soon.
+        if (self._scheduler is not None
+                and not self.settings.avoid_repeats.checked):
+            precision = self.settings.round_minutes_to_nearest.value
+            return self._slot_time(self._scheduler.next_slot(precision))
+
+        return self.generate_times(1)[0]
+
+    def record_answer(self, time: ClockTime, answer: "Answer"):
+        if self._scheduler is not None:
+            self._scheduler.record(
+                time.minute_of_dial(),
+                answer.hours_correct and answer.minutes_correct
+            )
+
+    def generate_times(self, count: int) -> list[ClockTime]:
+        if self.settings.avoid_repeats.checked:
+            slots = self._deal(count)
+        else:
+            slots = self._random.choices(self._slots(), k=count)
+
+        return [self._slot_time(slot) for slot in slots]
+
+    def _slots(self) -> range:
         precision = self.settings.round_minutes_to_nearest.value
-        return self._round_down(time, precision)
+        return range(0, MINUTES_PER_DIAL, precision)
+
+    def _on_settings_changed(self, change: "SettingsChange"):
+        if change.affects("round_minutes_to_nearest", "avoid_repeats"):
+            self._deck = []
+
+    def _deal(self, count: int) -> list[int]:
+        dealt = []
+
+        while len(dealt) < count:
+            if not self._deck:
+                self._deck = list(self._slots())
+                self._random.shuffle(self._deck)
+
+            take = min(count - len(dealt), len(self._deck))
+            dealt.extend(self._deck[-take:])
+            del self._deck[-take:]
+
+        return dealt
+
+    def _slot_time(self, slot: int) -> ClockTime:
+        hour, minute = divmod(slot, 60)
+        return ClockTime(hour or 12, minute)
+
+
+@dataclass
+class Answer:
+    hours_correct: bool
+    minutes_correct: bool
+
+
+def check_answer(time: ClockTime, hours: str, minutes: str) -> Answer:
+    return Answer(
+        hours_correct=_is_same(hours, time.hour12()),
+        minutes_correct=_is_same(minutes, time.minute()),
+    )
+
+
+def _is_same(input_value: str, actual: int) -> bool:
+    if input_value.isnumeric():
+        if actual == int(input_value):
+            return True
+
+    return False
 
 
 @dataclass
@@ -42,10 +110,105 @@ class CheckBoxSetting:
     checked: bool
 
 
+@dataclass(frozen=True)
+class SettingChange:
+    name: str
+    old: int | bool
+    new: int | bool
+
+
+@dataclass(frozen=True)
+class SettingsChange:
+    changes: tuple[SettingChange, ...]
+
+    def names(self) -> set[str]:
+        return {change.name for change in self.changes}
+
+    def affects(self, *names: str) -> bool:
+        return not self.names().isdisjoint(names)
+
+
 class Settings:
+    NAMES = (
+        "show_minute_marks",
+        "show_hour_marks",
+        "hours_text_interval",
+        "minutes_text_interval",
+        "round_minutes_to_nearest",
+        "avoid_repeats",
+        "animate_hands",
+    )
+
     def __init__(self):
         self.show_minute_marks = CheckBoxSetting(True)
         self.show_hour_marks = CheckBoxSetting(True)
         self.hours_text_interval = NumberSetting(1)
         self.minutes_text_interval = NumberSetting(5)
         self.round_minutes_to_nearest = NumberSetting(5)
+        self.avoid_repeats = CheckBoxSetting(False)
+        self.animate_hands = CheckBoxSetting(True)
+
+        self._listeners: list[Callable[[SettingsChange], None]] = []
+        self._schedule: Callable[[Callable[[], None]], None] | None = None
+        self._pending: dict[str, tuple[int | bool, int | bool]] = {}
+        self._flush_scheduled = False
+
+    def subscribe(self, listener: Callable[[SettingsChange], None]):
+        self._listeners.append(listener)
+
+    def set_scheduler(self, schedule: Callable[[Callable[[], None]], None]):
+        self._schedule = schedule
+
+    def value(self, name: str) -> int | bool:
+        setting = getattr(self, name)
+
+        if isinstance(setting, CheckBoxSetting):
+            return setting.checked
+
+        return setting.value
+
+    def values(self) -> dict[str, int | bool]:
+        return {name: self.value(name) for name in self.NAMES}
+
+    def update(self, **values: int | bool):
+        for name, value in values.items():
+            old = self.value(name)
+
+            if old == value:
+                continue
+
+            setting = getattr(self, name)
+            if isinstance(setting, CheckBoxSetting):
+                setting.checked = value
+            else:
+                setting.value = value
+
+            first, _ = self._pending.get(name, (old, value))
+            if first == value:
+                del self._pending[name]
+            else:
+                self._pending[name] = (first, value)
+
+        if not self._pending or self._flush_scheduled:
+            return
+
+        if self._schedule is None:
+            self._flush()
+        else:
+            self._flush_scheduled = True
+            self._schedule(self._flush)
+
+    def _flush(self):
+        self._flush_scheduled = False
+
+        if not self._pending:
+            return
+
+        change = SettingsChange(tuple(
+            SettingChange(name, old, new)
+            for name, (old, new) in self._pending.items()
+        ))
+        self._pending = {}
+
+        for listener in self._listeners:
+            listener(change)
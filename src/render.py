@@ -0,0 +1,201 @@
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QSize, QTime  # noqa: E402
+from PyQt6.QtGui import QColor  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from clocktime import ClockTime, MINUTES_PER_DIAL  # noqa: E402
+from rendercache import (  # noqa: E402
+    DEFAULT_MAX_BYTES,
+    RenderCache,
+    encode_png,
+    render_key,
+)
+from view import AnalogClock, AnalogClockSettings, to_qtime  # noqa: E402
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    minute_of_dial: int
+    show_hour_marks: bool
+    show_minute_marks: bool
+    hours_text_interval: int
+    minutes_text_interval: int
+
+    def time(self) -> ClockTime:
+        hour, minute = divmod(self.minute_of_dial, 60)
+        return ClockTime(hour or 12, minute)
+
+    def settings(self) -> AnalogClockSettings:
+        settings = AnalogClockSettings()
+        settings.show_hour_marks = self.show_hour_marks
+        settings.show_minute_marks = self.show_minute_marks
+        settings.hours_text_interval = self.hours_text_interval
+        settings.minutes_text_interval = self.minutes_text_interval
+        return settings
+
+    def file_name(self, size: int, dpr: float) -> str:
+        time = self.time()
+        marks = f"{int(self.show_hour_marks)}{int(self.show_minute_marks)}"
+        texts = f"{self.hours_text_interval}-{self.minutes_text_interval}"
+        return (
+            f"clock_{time.hour12():02}{time.minute():02}"
+            f"_marks{marks}_text{texts}_{size}px@{dpr:g}x.png"
+        )
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    output: Path
+    size: int
+    dpr: float
+    background: str
+    cache: Path | None = None
+    cache_max_bytes: int = DEFAULT_MAX_BYTES
+
+
+_app: QApplication | None = None
+_clock: AnalogClock | None = None
+_options: RenderOptions | None = None
+_cache: RenderCache | None = None
+
+
+def _init_worker(options: RenderOptions):
+    global _app, _clock, _options, _cache
+    _app = QApplication.instance() or QApplication([])
+    _clock = AnalogClock(QTime())
+    _options = options
+    _cache = (RenderCache(options.cache, options.cache_max_bytes)
+              if options.cache else None)
+
+
+def render_png(job: RenderJob) -> bytes:
+    _clock.set_settings(job.settings())
+    _clock.set_time(to_qtime(job.time()))
+    image = _clock.render_image(
+        QSize(_options.size, _options.size),
+        _options.dpr,
+        QColor(_options.background) if _options.background else None
+    )
+    return encode_png(image)
+
+
+def render_job(job: RenderJob) -> str:
+    if _cache is None:
+        data = render_png(job)
+    else:
+        key = render_key(job.time(), job.settings(), _options.size,
+                         _options.dpr, _options.background)
+        data = _cache.get_or_render(key, lambda: render_png(job))
+
+    path = _options.output / job.file_name(_options.size, _options.dpr)
+    path.write_bytes(data)
+    return str(path)
+
+
+def parse_time(text: str) -> int:
+    hour, _, minute = text.partition(":")
+    if not (hour.isnumeric() and minute.isnumeric()):
+        raise argparse.ArgumentTypeError(f"Expected H:MM, got {text!r}")
+
+    hour, minute = int(hour), int(minute)
+    if not (0 <= hour <= 23 and 0 <= minute <= 59):
+        raise argparse.ArgumentTypeError(f"Time out of range: {text!r}")
+
+    return (hour % 12) * 60 + minute
+
+
+def build_jobs(args: argparse.Namespace) -> list[RenderJob]:
+    if args.times:
+        minutes = sorted(set(args.times))
+    else:
+        minutes = range(0, MINUTES_PER_DIAL, args.step)
+
+    jobs = [
+        RenderJob(*combination)
+        for combination in itertools.product(
+            minutes,
+            args.hour_marks,
+            args.minute_marks,
+            args.hours_text_interval,
+            args.minutes_text_interval,
+        )
+    ]
+
+    # Minute marks are only shown together with hour marks, as in the
+    # settings dialog.
+    return [
+        job for job in jobs
+        if job.show_hour_marks or not job.show_minute_marks
+    ]
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Render analog clock faces to PNG files without a window."
+    )
+    parser.add_argument(
+        "times", nargs="*", type=parse_time,
+        help="times as H:MM; all dial positions at --step when omitted"
+    )
+    parser.add_argument("-o", "--output", type=Path, default=Path("clocks"))
+    parser.add_argument("--step", type=int, default=1,
+                        help="minutes between rendered times")
+    parser.add_argument("--size", type=int, default=400,
+                        help="image side in logical pixels")
+    parser.add_argument("--dpr", type=float, default=1.0,
+                        help="device pixel ratio of the images")
+    parser.add_argument("--background", default="white",
+                        help="background color, empty for transparent")
+    parser.add_argument("--hour-marks", type=int, nargs="+",
+                        choices=(0, 1), default=[1])
+    parser.add_argument("--minute-marks", type=int, nargs="+",
+                        choices=(0, 1), default=[1])
+    parser.add_argument("--hours-text-interval", type=int, nargs="+",
+                        choices=(0, 1, 3, 6), default=[1])
+    parser.add_argument("--minutes-text-interval", type=int, nargs="+",
+                        choices=(0, 5, 15, 30), default=[5])
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                        help="worker processes")
+    parser.add_argument("--cache", type=Path,
+                        help="directory of images kept between runs")
+    parser.add_argument("--cache-max-bytes", type=int,
+                        default=DEFAULT_MAX_BYTES,
+                        help="size the cache is evicted down to")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    jobs = build_jobs(args)
+    args.output.mkdir(parents=True, exist_ok=True)
+    options = RenderOptions(
+        args.output, args.size, args.dpr, args.background, args.cache,
+        args.cache_max_bytes
+    )
+
+    start = time.perf_counter()
+    chunksize = max(1, len(jobs) // (args.jobs * 4))
+
+    with ProcessPoolExecutor(max_workers=args.jobs,
+                             initializer=_init_worker,
+                             initargs=(options,)) as executor:
+        count = sum(1 for _ in executor.map(render_job, jobs,
+                                            chunksize=chunksize))
+
+    elapsed = time.perf_counter() - start
+    print(f"Rendered {count} clocks to {args.output} in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,154 @@
+import hashlib
+import mmap
+import os
+import secrets
+import threading
+from pathlib import Path
+from typing import Callable
+
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt6.QtGui import QImage
+
+from clocktime import ClockTime
+from view import RENDERER_VERSION, AnalogClockSettings
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Evicting down to a bit under the budget avoids rescanning on every write.
+EVICT_TO = 0.9
+SUFFIX = ".png"
+
+
+def render_key(time: ClockTime,
+               settings: AnalogClockSettings,
+               size: int,
+               dpr: float,
+               background: str | None = None) -> str:
+    key = (
+        RENDERER_VERSION,
+        time.minute_of_dial(),
+        time.second(),
+        settings.key(),
+        size,
+        dpr,
+        background,
+    )
+    return hashlib.sha256(repr(key).encode()).hexdigest()
+
+
+def encode_png(image: QImage) -> bytes:
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(data)
+
+
+class RenderCache:
+    """Encoded clock images on disk, shared between processes.
+
+    Entries are written to a temporary file and renamed into place, so
+    readers only ever see complete files. Hits bump the file's mtime,
+    which eviction uses as the last-use time. One instance may be used
+    from several threads.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self._directory = Path(directory)
+        self._max_bytes = max_bytes
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = sum(size for _, _, size in self._entries())
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> memoryview | None:
+        path = self._path(key)
+
+        try:
+            with open(path, "rb") as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        return memoryview(data)
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        temporary = path.with_name(
+            f"{path.name}.{os.getpid()}-{secrets.token_hex(4)}.tmp"
+        )
+
+        try:
+            temporary.write_bytes(data)
+            os.replace(temporary, path)
+        except OSError:
+            temporary.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._size += len(data)
+            if self._size > self._max_bytes:
+                self._evict()
+
+    def get_or_render(self,
+                      key: str,
+                      render: Callable[[], bytes]) -> bytes | memoryview:
+        data = self.get(key)
+
+        with self._lock:
+            if data is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if data is not None:
+            return data
+
+        data = render()
+        self.put(key, data)
+        return data
+
+    def evict(self):
+        with self._lock:
+            self._evict()
+
+    def _evict(self):
+        # Other processes write to the same directory, so rescan instead
+        # of trusting the running total.
+        entries = sorted(self._entries())
+        self._size = sum(size for _, _, size in entries)
+        target = self._max_bytes * EVICT_TO
+
+        for _, path, size in entries:
+            if self._size <= target:
+                break
+
+            try:
+                path.unlink()
+            except OSError:
+                # Already evicted by another process, or still open on
+                # Windows.
+                continue
+
+            self._size -= size
+
+    def size(self) -> int:
+        return self._size
+
+    def _path(self, key: str) -> Path:
+        return self._directory / key[:2] / (key + SUFFIX)
+
+    def _entries(self) -> list[tuple[float, Path, int]]:
+        entries = []
+
+        for path in self._directory.glob(f"*/*{SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime, path, stat.st_size))
+
+        return entries
@@ -0,0 +1,443 @@
+import argparse
+import bisect
+import gc
+import json
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from memory import current_rss_kib
+from model import Model, Settings
+
+FILE_MAGIC = b"LACR"
+FILE_VERSION = 1
+HEADER = struct.Struct("<4sB")
+EVENT = struct.Struct("<IB")
+LENGTH = struct.Struct("<B")
+SETTING = struct.Struct("<h")
+
+SAMPLE_EVERY = 10_000
+# Upper bounds of the latency histogram buckets, in milliseconds.
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 1000)
+
+
+class EventType(IntEnum):
+    NEW_TIME = 1
+    SHOW_DIGITAL = 2
+    CHECK = 3
+    ENTER_HOURS = 4
+    ENTER_MINUTES = 5
+    TYPE_HOURS = 6
+    TYPE_MINUTES = 7
+    OPEN_SETTINGS = 8
+    SAVE_SETTINGS = 9
+
+
+TEXT_EVENTS = (EventType.TYPE_HOURS, EventType.TYPE_MINUTES)
+
+
+@dataclass(frozen=True)
+class Event:
+    delay_ms: int
+    type: EventType
+    text: str = ""
+    settings: tuple[int, ...] = ()
+
+
+class EventWriter:
+    def __init__(self, path: Path):
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(HEADER.pack(FILE_MAGIC, FILE_VERSION))
+
+    def write(self, event: Event):
+        chunks = [EVENT.pack(min(event.delay_ms, 2 ** 32 - 1), event.type)]
+
+        if event.type in TEXT_EVENTS:
+            text = event.text.encode()[:255]
+            chunks += [LENGTH.pack(len(text)), text]
+
+        elif event.type == EventType.SAVE_SETTINGS:
+            chunks.append(LENGTH.pack(len(event.settings)))
+            chunks += [SETTING.pack(value) for value in event.settings]
+
+        self._file.write(b"".join(chunks))
+
+    def close(self):
+        self._file.close()
+
+
+def read_events(path: Path) -> Iterator[Event]:
+    with open(path, "rb") as file:
+        magic, version = HEADER.unpack(file.read(HEADER.size))
+
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError(f"{path} is not an event file")
+
+        while head := file.read(EVENT.size):
+            delay_ms, event_type = EVENT.unpack(head)
+            event_type = EventType(event_type)
+
+            if event_type in TEXT_EVENTS:
+                length, = LENGTH.unpack(file.read(LENGTH.size))
+                yield Event(delay_ms, event_type,
+                            text=file.read(length).decode())
+
+            elif event_type == EventType.SAVE_SETTINGS:
+                count, = LENGTH.unpack(file.read(LENGTH.size))
+                data = file.read(count * SETTING.size)
+                yield Event(delay_ms, event_type, settings=tuple(
+                    value for value, in SETTING.iter_unpack(data)
+                ))
+
+            else:
+                yield Event(delay_ms, event_type)
+
+
+class Recorder:
+    """Records what the user does in a MainWindow.
+
+    Create it before the Controller, so that opening the settings is
+    recorded before the controller's own handlers run.
+    """
+
+    def __init__(self, path: Path, main_window, model: Model):
+        self._writer = EventWriter(path)
+        self._last = time.monotonic()
+
+        main = main_window
+        time_input = main.time_input
+        signals = [
+            (main.time_generator_button.clicked, EventType.NEW_TIME),
+            (main.show_digital_button.clicked, EventType.SHOW_DIGITAL),
+            (time_input.check_button.clicked, EventType.CHECK),
+            (time_input.hours_return_pressed(), EventType.ENTER_HOURS),
+            (time_input.minutes_return_pressed(), EventType.ENTER_MINUTES),
+            (main.settings_button.clicked, EventType.OPEN_SETTINGS),
+        ]
+
+        for signal, event_type in signals:
+            signal.connect(lambda *_, t=event_type: self._record(t))
+
+        time_input.hours_edited().connect(
+            lambda text: self._record(EventType.TYPE_HOURS, text=text)
+        )
+        time_input.minutes_edited().connect(
+            lambda text: self._record(EventType.TYPE_MINUTES, text=text)
+        )
+        model.settings.subscribe(
+            lambda change: self._record(
+                EventType.SAVE_SETTINGS,
+                settings=tuple(int(value) for value in
+                               model.settings.values().values())
+            )
+        )
+
+    def _record(self, event_type: EventType, **payload):
+        now = time.monotonic()
+        event = Event(round((now - self._last) * 1000), event_type, **payload)
+        self._last = now
+        self._writer.write(event)
+
+    def close(self):
+        self._writer.close()
+
+
+def random_settings(rng: random.Random) -> tuple[int, ...]:
+    hour_marks = rng.random() < 0.8
+    values = {
+        "show_minute_marks": hour_marks and rng.random() < 0.8,
+        "show_hour_marks": hour_marks,
+        "hours_text_interval": rng.choice((0, 1, 3, 6)),
+        "minutes_text_interval": rng.choice((0, 5, 15, 30)),
+        "round_minutes_to_nearest": rng.choice((1, 5, 15, 30)),
+        "avoid_repeats": rng.random() < 0.5,
+        "animate_hands": rng.random() < 0.5,
+    }
+    return tuple(int(values[name]) for name in Settings.NAMES)
+
+
+def synthetic_events(count: int, seed: int) -> Iterator[Event]:
+    rng = random.Random(seed)
+    produced = 0
+
+    def human_delay() -> int:
+        return int(rng.lognormvariate(6.5, 0.6))
+
+    while produced < count:
+        session = [Event(human_delay(), EventType.NEW_TIME)]
+
+        if rng.random() < 0.05:
+            session.append(Event(human_delay(), EventType.OPEN_SETTINGS))
+
+            if rng.random() < 0.4:
+                session.append(Event(human_delay() * 3,
+                                     EventType.SAVE_SETTINGS,
+                                     settings=random_settings(rng)))
+
+        for text_type, enter_type, value in (
+            (EventType.TYPE_HOURS, EventType.ENTER_HOURS,
+             str(rng.randint(1, 12))),
+            (EventType.TYPE_MINUTES, EventType.ENTER_MINUTES,
+             str(rng.randrange(0, 60, 5))),
+        ):
+            for end in range(1, len(value) + 1):
+                session.append(Event(human_delay() // 3, text_type,
+                                     text=value[:end]))
+
+            if rng.random() < 0.3:
+                session.append(Event(human_delay(), enter_type))
+
+        session.append(Event(human_delay(), EventType.CHECK))
+
+        if rng.random() < 0.3:
+            session.append(Event(human_delay(), EventType.SHOW_DIGITAL))
+
+        for event in session[:count - produced]:
+            yield event
+
+        produced += len(session)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.total = 0
+        self.max_ms = 0.0
+
+    def add(self, milliseconds: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, milliseconds)] += 1
+        self.total += 1
+        self.max_ms = max(self.max_ms, milliseconds)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction."""
+        rank = fraction * self.total
+        seen = 0
+
+        for bound, count in zip(BUCKETS_MS + (self.max_ms,), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+
+        return self.max_ms
+
+    def to_dict(self) -> dict:
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS]
+        labels.append(f">{BUCKETS_MS[-1]}ms")
+        return {
+            "count": self.total,
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass
+class ReplayReport:
+    events: int = 0
+    histograms: dict[str, LatencyHistogram] = field(default_factory=dict)
+    samples: list[dict] = field(default_factory=list)
+
+    def add(self, event_type: EventType, seconds: float):
+        self.events += 1
+        histogram = self.histograms.get(event_type.name)
+        if histogram is None:
+            histogram = self.histograms[event_type.name] = LatencyHistogram()
+
+        histogram.add(seconds * 1000)
+
+    def to_dict(self) -> dict:
+        return {
+            "events": self.events,
+            "latency": {
+                name: histogram.to_dict()
+                for name, histogram in sorted(self.histograms.items())
+            },
+            "samples": self.samples,
+        }
+
+
+class Player:
+    def __init__(self, app, main_window, controller):
+        self._app = app
+        self._main = main_window
+        self._controller = controller
+
+    def dispatch(self, event: Event):
+        main = self._main
+        time_input = main.time_input
+        settings_window = self._controller._settings_window
+
+        if (settings_window is not None and settings_window.isVisible()
+                and event.type != EventType.SAVE_SETTINGS):
+            # The recorded dialog was closed without saving.
+            settings_window.reject()
+
+        if event.type == EventType.NEW_TIME:
+            main.time_generator_button.click()
+        elif event.type == EventType.SHOW_DIGITAL:
+            main.show_digital_button.click()
+        elif event.type == EventType.CHECK:
+            time_input.check_button.click()
+        elif event.type == EventType.ENTER_HOURS:
+            time_input.hours_return_pressed().emit()
+        elif event.type == EventType.ENTER_MINUTES:
+            time_input.minutes_return_pressed().emit()
+        elif event.type == EventType.TYPE_HOURS:
+            time_input.set_hours(event.text)
+        elif event.type == EventType.TYPE_MINUTES:
+            time_input.set_minutes(event.text)
+        elif event.type == EventType.OPEN_SETTINGS:
+            main.settings_button.click()
+        elif event.type == EventType.SAVE_SETTINGS:
+            self._save_settings(dict(zip(Settings.NAMES, event.settings)))
+
+        self._app.processEvents()
+
+    def _save_settings(self, values: dict[str, int]):
+        window = self._controller._get_settings_window()
+
+        # Older recordings save without opening the dialog first.
+        if not window.isVisible():
+            self._main.settings_button.click()
+
+        window.hour_marks_checkbox.setChecked(
+            bool(values.get("show_hour_marks", True))
+        )
+        window.minute_marks_checkbox.setChecked(
+            bool(values.get("show_minute_marks", True))
+        )
+        for dropdown, name in (
+            (window.hour_text_dropdown, "hours_text_interval"),
+            (window.minute_text_dropdown, "minutes_text_interval"),
+            (window.round_minutes_dropdown, "round_minutes_to_nearest"),
+        ):
+            if name in values:
+                window.set_current_value(dropdown, values[name])
+
+        window.avoid_repeats_checkbox.setChecked(
+            bool(values.get("avoid_repeats", False))
+        )
+        window.animate_hands_checkbox.setChecked(
+            bool(values.get("animate_hands", True))
+        )
+        window.set_button.click()
+
+
+def replay(args: argparse.Namespace) -> dict:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    from PyQt6.QtCore import QObject
+    from PyQt6.QtWidgets import QApplication
+
+    from attempts import AttemptLog
+    from controller import Controller
+    from view import MainWindow
+
+    app = QApplication.instance() or QApplication([])
+    report = ReplayReport()
+
+    with tempfile.TemporaryDirectory() as directory:
+        attempts = AttemptLog(Path(directory) / "attempts.sqlite3", "replay")
+        main_window = MainWindow()
+        controller = Controller(Model(args.seed), main_window, attempts)
+        main_window.show()
+        app.processEvents()
+        player = Player(app, main_window, controller)
+
+        def sample():
+            gc.collect()
+            report.samples.append({
+                "events": report.events,
+                "rss_kib": current_rss_kib(),
+                "qobjects": len(main_window.findChildren(QObject)),
+                "widgets": len(QApplication.allWidgets()),
+                "python_objects": len(gc.get_objects()),
+            })
+            print(json.dumps(report.samples[-1]), file=sys.stderr)
+
+        sample()
+        start = time.perf_counter()
+        due = 0.0
+
+        for event in read_events(args.events):
+            if args.speed > 0:
+                due += event.delay_ms / 1000 / args.speed
+                delay = start + due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            before = time.perf_counter()
+            player.dispatch(event)
+            report.add(event.type, time.perf_counter() - before)
+
+            if report.events % args.sample_every == 0:
+                sample()
+
+        sample()
+        main_window.close()
+        attempts.close()
+
+    result = report.to_dict()
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Replay recorded or synthetic sessions against the app."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = commands.add_parser(
+        "replay", help="replay an event file headlessly"
+    )
+    replay_parser.add_argument("events", type=Path)
+    replay_parser.add_argument("-o", "--output", type=Path)
+    replay_parser.add_argument("--speed", type=float, default=0,
+                               help="multiple of real time, 0 for full speed")
+    replay_parser.add_argument("--sample-every", type=int,
+                               default=SAMPLE_EVERY,
+                               help="events between memory samples")
+    replay_parser.add_argument("--seed", type=int, default=0)
+
+    generate_parser = commands.add_parser(
+        "generate", help="write a synthetic session"
+    )
+    generate_parser.add_argument("events", type=Path)
+    generate_parser.add_argument("--count", type=int, default=1_000_000)
+    generate_parser.add_argument("--seed", type=int, default=0)
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+
+    if args.command == "generate":
+        writer = EventWriter(args.events)
+        for event in synthetic_events(args.count, args.seed):
+            writer.write(event)
+        writer.close()
+        return 0
+
+    text = json.dumps(replay(args), indent=2)
+
+    if args.output:
+        args.output.write_text(text)
+    else:
+        print(text)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
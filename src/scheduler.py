@@ -0,0 +1,239 @@
+import argparse
+import heapq
+import math
+import os
+import random
+import statistics
+import struct
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from clocktime import MINUTES_PER_DIAL
+
+FILE_MAGIC = b"LACS"
+FILE_VERSION = 1
+HEADER = struct.Struct("<4sBQH")
+RECORD = struct.Struct("<HQffII")
+
+FIRST_INTERVAL = 3.0
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+MAX_EASE = 3.0
+# Questions to wait before showing again a time that was skipped unanswered.
+SKIP_DELAY = 5
+
+
+@dataclass
+class SlotState:
+    due: int = 0
+    interval: float = 0.0
+    ease: float = INITIAL_EASE
+    reviews: int = 0
+    lapses: int = 0
+    version: int = 0
+
+
+class SpacedScheduler:
+    def __init__(self, seed: int | None = None):
+        self._random = random.Random(seed)
+        self._states: dict[int, SlotState] = {}
+        self._heap: list[tuple[int, float, int, int]] = []
+        self._precision: int | None = None
+        self._step = 0
+        self._pending: int | None = None
+
+    def next_slot(self, precision: int) -> int:
+        if precision != self._precision:
+            self._rebuild(precision)
+
+        if self._pending is not None:
+            self._push(self._pending, self._step + SKIP_DELAY)
+            self._pending = None
+
+        while True:
+            due, _, version, slot = heapq.heappop(self._heap)
+            if self._states[slot].version == version:
+                break
+
+        self._step += 1
+        self._pending = slot
+        return slot
+
+    def record(self, slot: int, correct: bool):
+        if slot != self._pending:
+            return
+
+        self._pending = None
+        state = self._states[slot]
+        state.reviews += 1
+
+        if correct:
+            if state.interval < 1:
+                state.interval = FIRST_INTERVAL
+            else:
+                state.interval *= state.ease
+            state.ease = min(MAX_EASE, state.ease + 0.05)
+
+        else:
+            state.interval = 1.0
+            state.ease = max(MIN_EASE, state.ease - 0.2)
+            state.lapses += 1
+
+        self._push(slot, self._step + math.ceil(state.interval))
+
+    def mastery(self, slot: int) -> float:
+        state = self._states.get(slot)
+        return state.interval if state is not None else 0.0
+
+    def _rebuild(self, precision: int):
+        self._precision = precision
+        self._pending = None
+        self._heap = []
+
+        for slot in range(0, MINUTES_PER_DIAL, precision):
+            state = self._states.setdefault(slot, SlotState())
+            self._push(slot, state.due)
+
+    def _push(self, slot: int, due: int):
+        state = self._states[slot]
+        state.due = due
+        state.version += 1
+        heapq.heappush(
+            self._heap, (due, self._random.random(), state.version, slot)
+        )
+
+    def to_bytes(self) -> bytes:
+        chunks = [HEADER.pack(
+            FILE_MAGIC, FILE_VERSION, self._step, len(self._states)
+        )]
+
+        for slot, state in self._states.items():
+            chunks.append(RECORD.pack(
+                slot, state.due, state.interval, state.ease,
+                state.reviews, state.lapses
+            ))
+
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, seed: int | None = None):
+        magic, version, step, count = HEADER.unpack_from(data)
+
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            raise ValueError("Not a scheduler state file")
+
+        scheduler = cls(seed)
+        scheduler._step = step
+
+        for slot, due, interval, ease, reviews, lapses in RECORD.iter_unpack(
+            data[HEADER.size:HEADER.size + count * RECORD.size]
+        ):
+            scheduler._states[slot] = SlotState(
+                due, interval, ease, reviews, lapses
+            )
+
+        return scheduler
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_suffix(path.suffix + ".tmp")
+        temporary.write_bytes(self.to_bytes())
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: Path, seed: int | None = None):
+        path = Path(path)
+
+        try:
+            return cls.from_bytes(path.read_bytes(), seed)
+        except FileNotFoundError:
+            return cls(seed)
+        except (struct.error, ValueError):
+            # Truncated, or written by another version: start over.
+            return cls(seed)
+
+
+class SyntheticLearner:
+    def __init__(self, rng: random.Random, precision: int):
+        self._rng = rng
+        self.knowledge = {
+            slot: rng.uniform(0.0, 0.5)
+            for slot in range(0, MINUTES_PER_DIAL, precision)
+        }
+
+    def answer(self, slot: int) -> bool:
+        correct = self._rng.random() < self.knowledge[slot]
+        self.knowledge[slot] += (1 - self.knowledge[slot]) * 0.3
+        return correct
+
+    def forget(self, factor: float):
+        for slot in self.knowledge:
+            self.knowledge[slot] *= factor
+
+
+def simulate(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    last_session_correct = 0
+    knowledge = 0.0
+    start = time.perf_counter()
+
+    for _ in range(args.learners):
+        learner = SyntheticLearner(rng, args.precision)
+        scheduler = SpacedScheduler(rng.randrange(2 ** 32))
+        slots = list(learner.knowledge)
+
+        for session in range(args.sessions):
+            for _ in range(args.questions):
+                if args.uniform:
+                    slot = rng.choice(slots)
+                else:
+                    slot = scheduler.next_slot(args.precision)
+
+                correct = learner.answer(slot)
+                scheduler.record(slot, correct)
+
+                if session == args.sessions - 1:
+                    last_session_correct += correct
+
+            learner.forget(args.forgetting)
+
+        knowledge += statistics.fmean(learner.knowledge.values())
+
+    elapsed = time.perf_counter() - start
+    sessions = args.learners * args.sessions
+
+    return {
+        "strategy": "uniform" if args.uniform else "spaced",
+        "sessions": sessions,
+        "sessions_per_second": sessions / elapsed,
+        "last_session_accuracy": (
+            last_session_correct / (args.learners * args.questions)
+        ),
+        "final_mean_knowledge": knowledge / args.learners,
+    }
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Replay synthetic learners against the time scheduler."
+    )
+    parser.add_argument("--learners", type=int, default=100)
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=30,
+                        help="questions per session")
+    parser.add_argument("--precision", type=int, default=5,
+                        choices=(1, 5, 15, 30))
+    parser.add_argument("--forgetting", type=float, default=0.9,
+                        help="knowledge kept between sessions")
+    parser.add_argument("--uniform", action="store_true",
+                        help="sample uniformly instead, as a baseline")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    for name, value in simulate(parse_args(sys.argv[1:])).items():
+        print(f"{name}: {value}")
@@ -0,0 +1,711 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import secrets
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+from urllib.parse import parse_qs, urlsplit
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QSize, QTime  # noqa: E402
+from PyQt6.QtGui import QFont, QPalette  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from attempts import Attempt, AttemptLog  # noqa: E402
+from clocktime import MINUTES_PER_DIAL, ClockTime  # noqa: E402
+from model import Model, Settings, check_answer  # noqa: E402
+from rendercache import (  # noqa: E402
+    DEFAULT_MAX_BYTES,
+    RenderCache,
+    encode_png,
+    render_key,
+)
+from view import (  # noqa: E402
+    AnalogClock,
+    AnalogClockSettings,
+    ClockPainter,
+    to_qtime,
+)
+
+IMAGE_CACHE_CAPACITY = 2048
+MAX_BODY = 64 * 1024
+LATENCY_SAMPLES = 100_000
+# Clients are forgotten after this long without a request, and the least
+# recently active ones beyond MAX_CLIENTS.
+CLIENT_IDLE_SECONDS = 2 * 60 * 60
+MAX_CLIENTS = 10_000
+NO_STORE = "no-store"
+# Image names are never reused for different content.
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    414: "URI Too Long",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+log = logging.getLogger("server")
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    query: dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+    def json(self) -> dict:
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError:
+            raise HttpError(400, "Body is not JSON")
+
+        if not isinstance(data, dict):
+            raise HttpError(400, "Body is not a JSON object")
+
+        return data
+
+
+def text_field(data: dict, name: str, default: str = "") -> str:
+    value = data.get(name, default)
+
+    if isinstance(value, int) and not isinstance(value, bool):
+        value = str(value)
+
+    if not isinstance(value, str):
+        raise HttpError(400, f"{name} must be a string")
+
+    return value
+
+
+async def read_line(reader: asyncio.StreamReader, status: int) -> bytes:
+    try:
+        return await reader.readline()
+    except ValueError:
+        # Longer than the stream's buffer limit.
+        raise HttpError(status, REASONS[status])
+
+
+async def read_request(reader: asyncio.StreamReader) -> Request | None:
+    line = await read_line(reader, 414)
+    if not line:
+        return None
+
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+
+    headers = {}
+    while (line := await read_line(reader, 431)) not in (b"\r\n", b"\n",
+                                                         b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HttpError(400, "Malformed Content-Length")
+
+    if length < 0:
+        raise HttpError(400, "Malformed Content-Length")
+
+    if length > MAX_BODY:
+        raise HttpError(413, "Body too large")
+
+    body = await reader.readexactly(length) if length else b""
+    url = urlsplit(target)
+    connection = headers.get("connection", "").lower()
+
+    return Request(
+        method=method,
+        path=url.path,
+        query={
+            name: values[-1] for name, values in parse_qs(url.query).items()
+        },
+        body=body,
+        keep_alive=(connection != "close" if version == "HTTP/1.1"
+                    else connection == "keep-alive"),
+    )
+
+
+def response(status: int,
+             body: bytes,
+             content_type: str,
+             keep_alive: bool,
+             cache_control: str = NO_STORE) -> bytes:
+    head = (
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        f"Cache-Control: {cache_control}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+def analog_settings(settings: Settings) -> AnalogClockSettings:
+    analog = AnalogClockSettings()
+    analog.show_hour_marks = settings.show_hour_marks.checked
+    analog.show_minute_marks = settings.show_minute_marks.checked
+    analog.hours_text_interval = settings.hours_text_interval.value
+    analog.minutes_text_interval = settings.minutes_text_interval.value
+    return analog
+
+
+class ImageCache:
+    """PNG clock images shared by every client, addressed by opaque names
+    so the URL does not give the time away.
+
+    Images are rendered in the event loop's executor, so a cold cache
+    does not hold up other requests. A name is handed out straight away
+    and fetching the image waits for its render.
+    """
+
+    def __init__(self,
+                 size: int,
+                 capacity: int = IMAGE_CACHE_CAPACITY,
+                 disk: RenderCache | None = None):
+        self._size = QSize(size, size)
+        self._capacity = capacity
+        self._disk = disk
+        self._secret = secrets.token_bytes(16)
+        # Drawn like the desktop clock, but without touching a widget from
+        # the render threads.
+        clock = AnalogClock(QTime())
+        self._pen = clock.palette().color(QPalette.ColorRole.WindowText)
+        self._font = QFont(clock.font())
+        self._images: OrderedDict[
+            str, tuple[tuple, asyncio.Future[bytes]]
+        ] = OrderedDict()
+        self._keys: dict[tuple, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def name(self, time: ClockTime, settings: AnalogClockSettings) -> str:
+        key = (time.minute_of_dial(), settings.key(), self._size.width())
+        name = self._keys.get(key)
+
+        if name is None:
+            name = hashlib.blake2b(
+                repr(key).encode(), key=self._secret, digest_size=12
+            ).hexdigest()
+            self._keys[key] = name
+
+        if name in self._images:
+            self._images.move_to_end(name)
+            self.hits += 1
+        else:
+            self._images[name] = (key, self._render(time, settings))
+            self.misses += 1
+
+            if len(self._images) > self._capacity:
+                _, (evicted, _) = self._images.popitem(last=False)
+                del self._keys[evicted]
+
+        return name
+
+    async def warm(self,
+                   times: list[ClockTime],
+                   settings: AnalogClockSettings):
+        await asyncio.gather(*(
+            self._images[self.name(time, settings)][1] for time in times
+        ))
+
+    async def get(self, name: str) -> bytes | None:
+        cached = self._images.get(name)
+        return await cached[1] if cached is not None else None
+
+    def _render(self,
+                time: ClockTime,
+                settings: AnalogClockSettings) -> asyncio.Future[bytes]:
+        def render() -> bytes:
+            image = ClockPainter(settings).render_image(
+                to_qtime(time), self._size, self._pen, QFont(self._font)
+            )
+            return encode_png(image)
+
+        def render_cached() -> bytes:
+            if self._disk is None:
+                return render()
+
+            key = render_key(time, settings, self._size.width(), 1.0)
+            return bytes(self._disk.get_or_render(key, render))
+
+        return asyncio.get_running_loop().run_in_executor(None, render_cached)
+
+
+@dataclass
+class Client:
+    learner: str
+    model: Model
+    time: ClockTime | None = None
+    shown_at: float = 0.0
+    seen_at: float = 0.0
+
+
+@dataclass
+class Latencies:
+    samples: dict[str, deque[float]] = field(default_factory=dict)
+
+    def add(self, name: str, seconds: float):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=LATENCY_SAMPLES)
+
+        samples.append(seconds)
+
+    def summary(self) -> dict[str, dict]:
+        return {
+            name: percentiles(samples)
+            for name, samples in sorted(self.samples.items())
+        }
+
+
+def percentiles(samples: Iterable[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p99_ms": ordered[int(0.99 * (len(ordered) - 1))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+class ClassroomServer:
+    def __init__(self,
+                 settings: dict[str, int | bool],
+                 attempts: AttemptLog,
+                 image_size: int = 400,
+                 seed: int | None = None,
+                 disk_cache: RenderCache | None = None):
+        self._settings = settings
+        self._attempts = attempts
+        self._images = ImageCache(image_size, disk=disk_cache)
+        self._random = random.Random(seed)
+        # Least recently active first.
+        self._clients: OrderedDict[str, Client] = OrderedDict()
+        self.latencies = Latencies()
+
+    async def warm(self) -> int:
+        """Render the image of every time a question can ask."""
+        model = Model()
+        model.settings.update(**{**self._settings, "avoid_repeats": True})
+        precision = model.settings.round_minutes_to_nearest.value
+        times = model.generate_times(MINUTES_PER_DIAL // precision)
+        await self._images.warm(times, analog_settings(model.settings))
+        return len(times)
+
+    async def handle(self,
+                     reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                    if request is None:
+                        break
+
+                    start = time.perf_counter()
+                    status, content_type, body, cache_control = \
+                        await self.route(request)
+                    keep_alive = request.keep_alive
+                    self.latencies.add(
+                        request.path.split("/")[1] or "/",
+                        time.perf_counter() - start
+                    )
+
+                except HttpError as error:
+                    status, content_type = error.status, "application/json"
+                    body = json.dumps({"error": str(error)}).encode()
+                    keep_alive = False
+                    cache_control = NO_STORE
+
+                except Exception:
+                    log.exception("Error handling request")
+                    status, content_type = 500, "application/json"
+                    body = json.dumps({"error": REASONS[500]}).encode()
+                    keep_alive = False
+                    cache_control = NO_STORE
+
+                writer.write(response(
+                    status, body, content_type, keep_alive, cache_control
+                ))
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+
+        finally:
+            writer.close()
+
+    async def route(self, request: Request) -> tuple[int, str, bytes, str]:
+        if request.path.startswith("/clock/"):
+            return await self._clock_image(
+                request.path.removeprefix("/clock/")
+            )
+
+        routes = {
+            ("POST", "/join"): self._join,
+            ("GET", "/question"): self._question,
+            ("POST", "/answer"): self._answer,
+            ("GET", "/stats"): self._stats,
+        }
+        handler = routes.get((request.method, request.path))
+
+        if handler is None:
+            raise HttpError(404, f"No route for {request.method} "
+                                 f"{request.path}")
+
+        body = json.dumps(handler(request)).encode()
+        return 200, "application/json", body, NO_STORE
+
+    def _join(self, request: Request) -> dict:
+        learner = text_field(request.json(), "learner", "student")
+        model = Model(self._random.randrange(2 ** 32))
+        model.settings.update(**self._settings)
+
+        client_id = secrets.token_hex(8)
+        self._clients[client_id] = Client(
+            learner, model, seen_at=time.monotonic()
+        )
+        self._forget_clients()
+        return {"client": client_id}
+
+    def _client(self, client_id: str | None) -> Client:
+        self._forget_clients()
+        client = self._clients.get(client_id)
+
+        if client is None:
+            raise HttpError(404, "Unknown client")
+
+        client.seen_at = time.monotonic()
+        self._clients.move_to_end(client_id)
+        return client
+
+    def _forget_clients(self):
+        idle_since = time.monotonic() - CLIENT_IDLE_SECONDS
+
+        while self._clients:
+            client = next(iter(self._clients.values()))
+
+            if (len(self._clients) <= MAX_CLIENTS
+                    and client.seen_at > idle_since):
+                break
+
+            self._clients.popitem(last=False)
+
+    def _question(self, request: Request) -> dict:
+        client = self._client(request.query.get("client"))
+        client.time = client.model.generate_random_time()
+        client.shown_at = time.monotonic()
+
+        name = self._images.name(
+            client.time, analog_settings(client.model.settings)
+        )
+        return {"image": f"/clock/{name}.png"}
+
+    def _answer(self, request: Request) -> dict:
+        data = request.json()
+        client = self._client(text_field(data, "client"))
+
+        if client.time is None:
+            raise HttpError(400, "No question was asked")
+
+        hours = text_field(data, "hours")
+        minutes = text_field(data, "minutes")
+        answer = check_answer(client.time, hours, minutes)
+        client.model.record_answer(client.time, answer)
+
+        self._attempts.record(Attempt.create(
+            learner=client.learner,
+            target=client.time,
+            hours_input=hours,
+            minutes_input=minutes,
+            answer=answer,
+            answer_seconds=time.monotonic() - client.shown_at,
+            settings=client.model.settings.values(),
+        ))
+
+        return {
+            "hours_correct": answer.hours_correct,
+            "minutes_correct": answer.minutes_correct,
+            "time": str(client.time),
+        }
+
+    def _stats(self, request: Request) -> dict:
+        return {
+            "clients": len(self._clients),
+            "image_cache_hits": self._images.hits,
+            "image_cache_misses": self._images.misses,
+            "latency": self.latencies.summary(),
+        }
+
+    async def _clock_image(self,
+                           file_name: str) -> tuple[int, str, bytes, str]:
+        image = await self._images.get(file_name.removesuffix(".png"))
+
+        if image is None:
+            raise HttpError(404, "Unknown clock image")
+
+        return 200, "image/png", image, IMMUTABLE
+
+
+class HttpClient:
+    def __init__(self, host: str, port: int):
+        self._host = host
+        self._port = port
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def request(self,
+                      method: str,
+                      path: str,
+                      data: dict | None = None) -> tuple[int, bytes]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(
+                self._host, self._port
+            )
+
+        body = json.dumps(data).encode() if data is not None else b""
+        self._writer.write(
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self._host}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "\r\n".encode("latin-1") + body
+        )
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        status = int(status_line.split()[1])
+        headers = {}
+
+        while (line := await self._reader.readline()) != b"\r\n":
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        body = await self._reader.readexactly(int(headers["content-length"]))
+
+        if headers.get("connection") == "close":
+            await self.close()
+
+        return status, body
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+
+
+async def simulate_client(host: str,
+                          port: int,
+                          index: int,
+                          rounds: int,
+                          latencies: Latencies):
+    client = HttpClient(host, port)
+    rng = random.Random(index)
+
+    async def timed(name: str, method: str, path: str, data=None) -> bytes:
+        start = time.perf_counter()
+        status, body = await client.request(method, path, data)
+        latencies.add(name, time.perf_counter() - start)
+
+        if status != 200:
+            raise RuntimeError(f"{method} {path} failed with {status}")
+
+        return body
+
+    try:
+        joined = json.loads(
+            await timed("join", "POST", "/join", {"learner": f"sim{index}"})
+        )
+
+        for _ in range(rounds):
+            question = json.loads(await timed(
+                "question", "GET", f"/question?client={joined['client']}"
+            ))
+            await timed("image", "GET", question["image"])
+            await timed("answer", "POST", "/answer", {
+                "client": joined["client"],
+                "hours": str(rng.randint(1, 12)),
+                "minutes": str(rng.randrange(0, 60, 5)),
+            })
+
+    finally:
+        await client.close()
+
+
+async def load(args: argparse.Namespace) -> dict:
+    latencies = Latencies()
+    start = time.perf_counter()
+
+    await asyncio.gather(*(
+        simulate_client(args.host, args.port, index, args.rounds, latencies)
+        for index in range(args.clients)
+    ))
+
+    elapsed = time.perf_counter() - start
+    requests = sum(len(samples) for samples in latencies.samples.values())
+    client = HttpClient(args.host, args.port)
+    _, server_stats = await client.request("GET", "/stats")
+    await client.close()
+
+    return {
+        "clients": args.clients,
+        "requests": requests,
+        "requests_per_second": requests / elapsed,
+        "client_latency": {
+            "all": percentiles([
+                sample for samples in latencies.samples.values()
+                for sample in samples
+            ]),
+            **latencies.summary(),
+        },
+        "server": json.loads(server_stats),
+    }
+
+
+def run_load(args: argparse.Namespace) -> dict:
+    if args.port is not None:
+        return asyncio.run(load(args))
+
+    # Run the server in its own process so the simulated clients do not
+    # share its event loop.
+    with tempfile.TemporaryDirectory() as directory:
+        server = subprocess.Popen(
+            [sys.executable, __file__, "serve", "--host", args.host,
+             "--port", "0", "--store", str(Path(directory) / "load.sqlite3"),
+             "--seed", "0"],
+            stdout=subprocess.PIPE, text=True
+        )
+
+        try:
+            args.port = int(server.stdout.readline().rsplit(":", 1)[1])
+            return asyncio.run(load(args))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+async def serve(args: argparse.Namespace):
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    settings = Settings()
+    settings.update(
+        round_minutes_to_nearest=args.round_minutes,
+        avoid_repeats=args.avoid_repeats,
+        show_hour_marks=not args.no_hour_marks,
+        show_minute_marks=not (args.no_minute_marks or args.no_hour_marks),
+        hours_text_interval=args.hours_text_interval,
+        minutes_text_interval=args.minutes_text_interval,
+    )
+    attempts = AttemptLog(args.store, "classroom")
+    classroom = ClassroomServer(
+        settings.values(), attempts, args.image_size, args.seed,
+        RenderCache(args.cache, args.cache_max_bytes) if args.cache else None
+    )
+
+    start = time.perf_counter()
+    count = await classroom.warm()
+    print(f"Rendered {count} clock images in "
+          f"{time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+    server = await asyncio.start_server(
+        classroom.handle, args.host, args.port, backlog=512
+    )
+    host, port = server.sockets[0].getsockname()[:2]
+    print(f"Listening on http://{host}:{port}", flush=True)
+
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        attempts.close()
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run a classroom quiz over the local network."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="run the quiz server")
+    serve_parser.add_argument("--host", default="0.0.0.0")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--store", type=Path,
+                              default=Path("classroom.sqlite3"),
+                              help="database the answers are written to")
+    serve_parser.add_argument("--image-size", type=int, default=400)
+    serve_parser.add_argument("--cache", type=Path,
+                              help="directory of images kept between runs")
+    serve_parser.add_argument("--cache-max-bytes", type=int,
+                              default=DEFAULT_MAX_BYTES,
+                              help="size the cache is evicted down to")
+    serve_parser.add_argument("--seed", type=int)
+    serve_parser.add_argument("--round-minutes", type=int, default=5,
+                              choices=(1, 5, 15, 30))
+    serve_parser.add_argument("--avoid-repeats", action="store_true")
+    serve_parser.add_argument("--hours-text-interval", type=int, default=1,
+                              choices=(0, 1, 3, 6))
+    serve_parser.add_argument("--minutes-text-interval", type=int,
+                              default=5, choices=(0, 5, 15, 30))
+    serve_parser.add_argument("--no-hour-marks", action="store_true")
+    serve_parser.add_argument("--no-minute-marks", action="store_true")
+
+    load_parser = commands.add_parser(
+        "load", help="measure latency with simulated clients"
+    )
+    load_parser.add_argument("--host", default="127.0.0.1")
+    load_parser.add_argument("--port", type=int,
+                             help="server to load, by default one is started")
+    load_parser.add_argument("--clients", type=int, default=200)
+    load_parser.add_argument("--rounds", type=int, default=20,
+                             help="questions answered by each client")
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(serve(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    print(json.dumps(run_load(args), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,129 @@
+import math
+from typing import Callable
+
+from PyQt6.QtCore import QEvent, QObject, Qt, QTime, QTimer, pyqtSignal
+from PyQt6.QtWidgets import QWidget
+
+MSECS_PER_MINUTE = 60_000
+
+# Every interval divides a minute evenly, so ticks aligned to multiples of
+# the interval since midnight always land on the minute boundary too. The
+# hands only show whole seconds, so ticking faster never moves them.
+TICK_INTERVALS_MS = (
+    1_000, 2_000, 3_000, 5_000, 10_000, 15_000, 20_000, 30_000,
+    MSECS_PER_MINUTE,
+)
+
+# Only sent since Qt 6.6. Before that, screen changes of the window are
+# followed instead.
+DPR_CHANGE = getattr(QEvent.Type, "DevicePixelRatioChange", None)
+
+# Degrees the minute hand turns per millisecond.
+MINUTE_HAND_SPEED = 360 / (60 * MSECS_PER_MINUTE)
+
+
+class TickScheduler(QObject):
+    tick = pyqtSignal(QTime)
+
+    def __init__(self,
+                 window: QWidget,
+                 hand_length: Callable[[], float],
+                 parent=None,
+                 clock: QWidget | None = None):
+        super().__init__(parent)
+        self._window = window
+        self._hand_length = hand_length
+        # The widget hand_length depends on, if it can resize on its own.
+        self._clock = clock or window
+        self._running = False
+        self._screen_watched = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_timeout)
+
+        window.installEventFilter(self)
+        if self._clock is not window:
+            self._clock.installEventFilter(self)
+
+    def start(self):
+        self._running = True
+        self._watch_screen()
+        self._emit_and_schedule()
+
+    def stop(self):
+        self._running = False
+        self._timer.stop()
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def interval(self) -> int:
+        # Longest interval over which the minute hand tip moves at most
+        # one device pixel.
+        tip_speed = self._hand_length() * math.radians(MINUTE_HAND_SPEED)
+
+        if tip_speed <= 0:
+            return MSECS_PER_MINUTE
+
+        for interval in reversed(TICK_INTERVALS_MS):
+            if interval * tip_speed <= 1:
+                return interval
+
+        return TICK_INTERVALS_MS[0]
+
+    def eventFilter(self, a0, a1):
+        if a0 is self._clock and self._running:
+            if a1.type() in (QEvent.Type.Resize, DPR_CHANGE):
+                self._reschedule()
+
+        if a0 is self._window and self._running:
+            event_type = a1.type()
+
+            if event_type in (QEvent.Type.Hide, QEvent.Type.WindowStateChange):
+                if not self._is_visible():
+                    self._timer.stop()
+
+            if event_type in (QEvent.Type.Show,
+                              QEvent.Type.WindowStateChange):
+                if self._is_visible():
+                    self._watch_screen()
+                    self._emit_and_schedule()
+
+            if event_type == QEvent.Type.Resize:
+                self._reschedule()
+
+        return super().eventFilter(a0, a1)
+
+    def _watch_screen(self):
+        if DPR_CHANGE is not None or self._screen_watched:
+            return
+
+        handle = self._window.windowHandle()
+
+        if handle is not None:
+            handle.screenChanged.connect(self._reschedule)
+            self._screen_watched = True
+
+    def _reschedule(self):
+        if self._timer.isActive():
+            self._schedule(QTime.currentTime())
+
+    def _is_visible(self) -> bool:
+        return self._window.isVisible() and not self._window.isMinimized()
+
+    def _on_timeout(self):
+        if self._running and self._is_visible():
+            self._emit_and_schedule()
+
+    def _emit_and_schedule(self):
+        now = QTime.currentTime()
+        self.tick.emit(now)
+
+        if self._is_visible():
+            self._schedule(now)
+
+    def _schedule(self, now: QTime):
+        interval = self.interval()
+        self._timer.start(interval - now.msecsSinceStartOfDay() % interval)
@@ -0,0 +1,202 @@
+import functools
+import inspect
+import json
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable
+
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer
+from PyQt6.QtWidgets import QApplication, QLabel, QWidget
+
+DEFAULT_CAPACITY = 100_000
+PAINT_SPAN = "AnalogClock.paintEvent"
+
+INPUT_EVENTS = (
+    QEvent.Type.MouseButtonPress,
+    QEvent.Type.KeyPress,
+)
+
+
+class Tracer:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        # Spans are (name, category, start ns, duration ns, thread id).
+        self._spans: deque[tuple[str, str, int, int, int]] = deque(
+            maxlen=capacity
+        )
+        self._frame_times: deque[float] = deque(maxlen=240)
+        self._origin = time.perf_counter_ns()
+        self.last_input_ns: int | None = None
+
+    def add(self, name: str, category: str, start_ns: int, end_ns: int):
+        self._spans.append(
+            (name, category, start_ns, end_ns - start_ns, threading.get_ident())
+        )
+
+        if name == PAINT_SPAN:
+            self._frame_times.append((end_ns - start_ns) / 1e6)
+
+    def wrap(self, name: str, category: str, func: Callable) -> Callable:
+        # PyQt drops signal arguments a slot does not accept, which it can
+        # no longer see through the wrapper, so do it here instead.
+        code = func.__code__
+        takes_varargs = code.co_flags & inspect.CO_VARARGS
+        positional = None if takes_varargs else code.co_argcount
+
+        @functools.wraps(func)
+        def traced(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args[:positional], **kwargs)
+            finally:
+                self.add(name, category, start, time.perf_counter_ns())
+
+        return traced
+
+    def instrument(self, cls: type, names: list[str], category: str):
+        for name in names:
+            method = getattr(cls, name)
+            setattr(cls, name,
+                    self.wrap(f"{cls.__name__}.{name}", category, method))
+
+    def frame_percentiles(self) -> dict[str, float]:
+        frames = list(self._frame_times)
+        if len(frames) < 2:
+            return {}
+
+        cuts = statistics.quantiles(frames, n=100)
+        return {
+            "last": frames[-1],
+            "p50": cuts[49],
+            "p95": cuts[94],
+            "p99": cuts[98],
+        }
+
+    def chrome_trace(self) -> dict:
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": (start - self._origin) / 1000,
+                    "dur": duration / 1000,
+                    "pid": pid,
+                    "tid": tid,
+                }
+                for name, category, start, duration, tid in self._spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def dump(self, path: Path):
+        Path(path).write_text(json.dumps(self.chrome_trace()))
+
+
+class InputLatencyFilter(QObject):
+    def __init__(self, tracer: Tracer, parent=None):
+        super().__init__(parent)
+        self._tracer = tracer
+
+    def eventFilter(self, a0, a1):
+        if a1.type() in INPUT_EVENTS:
+            # Measure from the latest input, so one that never repaints the
+            # clock, like typing an answer, is replaced by the next one.
+            self._tracer.last_input_ns = time.perf_counter_ns()
+
+        return super().eventFilter(a0, a1)
+
+
+class FrameTimeOverlay(QLabel):
+    def __init__(self, tracer: Tracer, parent: QWidget):
+        super().__init__(parent)
+        self._tracer = tracer
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 160);"
+            "color: white; font-size: 11px; padding: 2px;"
+        )
+        self.move(4, 4)
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._refresh)
+        self._timer.start(500)
+
+    def _refresh(self):
+        frames = self._tracer.frame_percentiles()
+        if not frames:
+            return
+
+        self.setText(" ".join(
+            f"{name} {value:.2f}ms" for name, value in frames.items()
+        ))
+        self.adjustSize()
+        self.raise_()
+
+
+def _trace_input_latency(tracer: Tracer, paint: Callable) -> Callable:
+    @functools.wraps(paint)
+    def traced(*args, **kwargs):
+        result = paint(*args, **kwargs)
+
+        if tracer.last_input_ns is not None:
+            tracer.add("input to paint", "latency",
+                       tracer.last_input_ns, time.perf_counter_ns())
+            tracer.last_input_ns = None
+
+        return result
+
+    return traced
+
+
+def install(app: QApplication) -> Tracer:
+    from controller import Controller
+    from view import (
+        AnalogClock,
+        ClockBoard,
+        ClockPainter,
+        DigitalClock,
+        DigitalClockFace,
+        MirrorWindow,
+    )
+
+    tracer = Tracer()
+    tracer.instrument(ClockPainter, [
+        "render_layer",
+        "render_layer_image",
+        "draw_marks",
+        "draw_numbers",
+        "draw_hour_hand",
+        "draw_minute_hand",
+        "draw_hands_at",
+        "render_hand_sprite",
+        "draw_hand_sprite",
+    ], "paint")
+    # Besides the regular path, the clock paints from hand sprites while
+    # animating and from the shared frame while mirrored.
+    tracer.instrument(AnalogClock, [
+        "paintEvent",
+        "_paint_hand_sprites",
+        "shared_frame",
+        "draw_shared_frame",
+    ], "paint")
+    AnalogClock.paintEvent = _trace_input_latency(
+        tracer, AnalogClock.paintEvent
+    )
+    tracer.instrument(MirrorWindow, ["paintEvent"], "paint")
+    tracer.instrument(ClockBoard, ["paintEvent"], "paint")
+    tracer.instrument(DigitalClock, ["_set_text"], "view")
+    tracer.instrument(DigitalClockFace, ["paintEvent"], "paint")
+    tracer.instrument(Controller, [
+        "_update_time",
+        "_check_input",
+        "_open_settings",
+        "_save_settings",
+    ], "controller")
+
+    app.installEventFilter(InputLatencyFilter(tracer, app))
+    return tracer
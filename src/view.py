@@ -1,8 +1,38 @@
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
+from enum import Enum
 import math
-
-from PyQt6.QtCore import Qt, QTime, QPoint
-from PyQt6.QtGui import QColor, QIntValidator, QPainter, QPolygon
+from typing import Callable
+
+from PyQt6.QtCore import (
+    Qt,
+    QEasingCurve,
+    QObject,
+    QTime,
+    QPoint,
+    QPointF,
+    QRect,
+    QRectF,
+    QRunnable,
+    QSize,
+    QThreadPool,
+    QVariantAnimation,
+    pyqtSignal,
+)
+from PyQt6.QtGui import (
+    QColor,
+    QFont,
+    QFontMetrics,
+    QGuiApplication,
+    QImage,
+    QIntValidator,
+    QPainter,
+    QPalette,
+    QPixmap,
+    QPolygon,
+    QRegion,
+    QStaticText,
+    QTransform,
+)
 from dataclasses import dataclass
 from PyQt6.QtWidgets import (
     QCheckBox,
@@ -19,6 +49,20 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from clocktime import MINUTES_PER_DIAL, ClockTime
+
+HAND_ANIMATION_MS = 600
+# Bump whenever ClockPainter output changes, to invalidate cached images.
+RENDERER_VERSION = 1
+
+
+def to_qtime(time: ClockTime) -> QTime:
+    return QTime(time.hour(), time.minute(), time.second())
+
+
+def from_qtime(time: QTime) -> ClockTime:
+    return ClockTime(time.hour(), time.minute(), time.second())
+
 
 @dataclass
 class SelectionItem:
@@ -33,6 +77,15 @@ class AnalogClockSettings:
         self.hours_text_interval = 1
         self.minutes_text_interval = 5
 
+    def key(self) -> tuple:
+        return self.marks_key() + self.numbers_key()
+
+    def marks_key(self) -> tuple:
+        return self.show_hour_marks, self.show_minute_marks
+
+    def numbers_key(self) -> tuple:
+        return self.hours_text_interval, self.minutes_text_interval
+
 
 class MainWindow(QWidget):
     def __init__(self, parent=None):
@@ -52,6 +105,28 @@ class MainWindow(QWidget):
         layout = QVBoxLayout(self)
 
         top_layout = QHBoxLayout()
+        self.live_button = QPushButton("Live", self)
+        self.live_button.setCheckable(True)
+        self.live_button.setFixedWidth(90)
+        self.live_button.setStyleSheet("font-size: 18px;")
+        top_layout.addWidget(self.live_button)
+        self.board_button = QPushButton("Board", self)
+        self.board_button.setFixedWidth(90)
+        self.board_button.setStyleSheet("font-size: 18px;")
+        top_layout.addWidget(self.board_button)
+        self.export_button = QPushButton("Export", self)
+        self.export_button.setFixedWidth(90)
+        self.export_button.setStyleSheet("font-size: 18px;")
+        top_layout.addWidget(self.export_button)
+        self.drill_button = QPushButton("Drill", self)
+        self.drill_button.setCheckable(True)
+        self.drill_button.setFixedWidth(90)
+        self.drill_button.setStyleSheet("font-size: 18px;")
+        top_layout.addWidget(self.drill_button)
+        self.mirror_button = QPushButton("Mirror", self)
+        self.mirror_button.setFixedWidth(90)
+        self.mirror_button.setStyleSheet("font-size: 18px;")
+        top_layout.addWidget(self.mirror_button)
         top_layout.addStretch()
         self.settings_button = QPushButton("Settings", self)
         self.settings_button.setFixedWidth(90)
@@ -75,9 +150,60 @@ class MainWindow(QWidget):
         self.time_generator_button = QPushButton("New Time", self)
         layout.addWidget(self.time_generator_button)
 
-    def update_analog_clock_time(self, time: QTime):
-        self._analog_clock.set_time(time)
-        self._analog_clock.update()
+        self._mirror_window: MirrorWindow | None = None
+
+    def update_analog_clock_time(self, time: ClockTime, animate=False):
+        if animate:
+            self._analog_clock.animate_to(to_qtime(time))
+        else:
+            self._analog_clock.set_time(to_qtime(time))
+
+    def prefetch_analog_frames(
+            self,
+            times: list[ClockTime],
+            done: Callable[[list[tuple[ClockTime, QPixmap]]], None]):
+        self._analog_clock.render_frames_async(
+            [to_qtime(time) for time in times],
+            lambda frames: done(list(zip(times, frames)))
+        )
+
+    def show_analog_frame(self, time: ClockTime, frame: QPixmap) -> bool:
+        return self._analog_clock.show_frame(to_qtime(time), frame)
+
+    def analog_clock_widget(self) -> QWidget:
+        return self._analog_clock
+
+    def analog_clock_painted(self):
+        return self._analog_clock.painted
+
+    def show_mirror_window(self):
+        if self._mirror_window is None:
+            self._mirror_window = MirrorWindow(self._analog_clock)
+
+        mirror = self._mirror_window
+        screens = [
+            screen for screen in QGuiApplication.screens()
+            if screen != self.screen()
+        ]
+
+        if screens:
+            # Usually the projector: fill it.
+            mirror.setScreen(screens[0])
+            mirror.move(screens[0].geometry().topLeft())
+            mirror.showFullScreen()
+        else:
+            mirror.show()
+
+        mirror.raise_()
+
+    def closeEvent(self, a0):
+        if self._mirror_window is not None:
+            self._mirror_window.close()
+
+        super().closeEvent(a0)
+
+    def analog_minute_hand_length(self) -> float:
+        return self._analog_clock.minute_hand_length()
 
     def get_analog_settings(self):
         return self._analog_clock.get_current_settings()
@@ -85,8 +211,8 @@ class MainWindow(QWidget):
     def update_analog_clock_settings(self, settings: AnalogClockSettings):
         self._analog_clock.set_settings(settings)
 
-    def update_digital_clock_time(self, time: QTime):
-        self._digital_clock.set_time(time)
+    def update_digital_clock_time(self, time: ClockTime):
+        self._digital_clock.set_time(to_qtime(time))
         self._digital_clock.update()
 
     def show_digital_clock(self):
@@ -96,78 +222,195 @@ class MainWindow(QWidget):
         self._digital_clock.hide_clock()
 
 
-class AnalogClock(QWidget):
-    def __init__(self, time: QTime, parent=None):
-        super().__init__(parent)
-        self._time = time
-        self._settings = AnalogClockSettings()
+class ClockPainter:
+    def __init__(self, settings: AnalogClockSettings | None = None):
+        self.settings = settings or AnalogClockSettings()
+        self.hour_hand = QPolygon([
+            QPoint(5, 8),
+            QPoint(-5, 8),
+            QPoint(0, -35)
+        ])
+        self.minute_hand = QPolygon([
+            QPoint(3, 8),
+            QPoint(-3, 8),
+            QPoint(0, -55)
+        ])
         self._set_colors()
 
-    def get_current_settings(self):
-        settings = AnalogClockSettings()
-        settings.hours_text_interval = self._settings.hours_text_interval
-        settings.minutes_text_interval = self._settings.minutes_text_interval
-        settings.show_hour_marks = self._settings.show_hour_marks
-        settings.show_minute_marks = self._settings.show_minute_marks
-        return settings
-
-    def set_settings(self, settings: AnalogClockSettings):
-        self._settings = settings
-        self.update()
+    def _set_colors(self):
+        self.hour_numbers_color = QColor("red")
+        self.hour_hand_color = QColor("red")
+
+        self.minute_numbers_color = QColor("teal")
+        self.minute_hand_color = QColor("teal")
+
+    @staticmethod
+    def transform(target: QPainter | QTransform, rect: QRect):
+        side = min(rect.width(), rect.height())
+        center = QRectF(rect).center()
+        target.translate(center.x(), center.y())
+        target.scale(side / 200.0, side / 200.0)
+
+    @staticmethod
+    def hour_angle(time: QTime) -> float:
+        return 30 * (time.hour() % 12 + time.minute() / 60.0)
+
+    @staticmethod
+    def minute_angle(time: QTime) -> float:
+        return 6 * (time.minute() + time.second() / 60.0)
+
+    @staticmethod
+    def dial_minutes(time: QTime) -> float:
+        return (time.hour() % 12) * 60 + time.minute() + time.second() / 60.0
+
+    @staticmethod
+    def dial_angles(dial_minutes: float) -> tuple[float, float]:
+        return dial_minutes / 2.0, (dial_minutes % 60) * 6
+
+    def hand_rects(self, time: QTime, rect: QRect) -> tuple[QRect, QRect]:
+        return self.angle_rects(
+            self.hour_angle(time), self.minute_angle(time), rect
+        )
 
-    def set_time(self, time: QTime):
-        self._time = time
+    def angle_rects(self,
+                    hour_angle: float,
+                    minute_angle: float,
+                    rect: QRect) -> tuple[QRect, QRect]:
+        return (
+            self._hand_rect(self.hour_hand, hour_angle, rect),
+            self._hand_rect(self.minute_hand, minute_angle, rect),
+        )
 
-    def _set_colors(self):
-        self._hour_numbers_color = QColor("red")
-        self._hour_hand_color = QColor("red")
+    def _hand_rect(self, hand: QPolygon, angle: float, rect: QRect) -> QRect:
+        transform = QTransform()
+        self.transform(transform, rect)
+        transform.rotate(angle)
+        # Widen by a couple of pixels to cover antialiased edges.
+        return transform.map(hand).boundingRect().adjusted(-2, -2, 2, 2)
 
-        self._minute_numbers_color = QColor("teal")
-        self._minute_hand_color = QColor("teal")
+    def hands_region(self, time: QTime, rect: QRect) -> QRegion:
+        return self.angles_region(
+            self.hour_angle(time), self.minute_angle(time), rect
+        )
 
-    def paintEvent(self, a0):
-        side = min(self.width(), self.height())
+    def angles_region(self,
+                      hour_angle: float,
+                      minute_angle: float,
+                      rect: QRect) -> QRegion:
+        hour_rect, minute_rect = self.angle_rects(
+            hour_angle, minute_angle, rect
+        )
+        return QRegion(hour_rect).united(minute_rect)
 
-        painter = QPainter(self)
+    def begin(self, painter: QPainter, rect: QRect, pen: QColor, font: QFont):
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.translate(self.width() / 2, self.height() / 2)
-        painter.scale(side / 200.0, side / 200.0)
-
-        if self._settings.show_hour_marks:
-            self._draw_hour_marks(painter)
+        painter.setPen(pen)
+        painter.setFont(font)
+        self.transform(painter, rect)
+
+    def render_layer(self,
+                     size: QSize,
+                     dpr: float,
+                     draw: Callable[[QPainter], None],
+                     pen: QColor,
+                     font: QFont) -> QPixmap:
+        pixmap = QPixmap(size * dpr)
+        self._paint_layer(pixmap, size, dpr, draw, pen, font)
+        return pixmap
+
+    def render_layer_image(self,
+                           size: QSize,
+                           dpr: float,
+                           draw: Callable[[QPainter], None],
+                           pen: QColor,
+                           font: QFont) -> QImage:
+        # Unlike QPixmap, QImage can be painted outside the GUI thread.
+        image = QImage(size * dpr, QImage.Format.Format_ARGB32_Premultiplied)
+        self._paint_layer(image, size, dpr, draw, pen, font)
+        return image
+
+    def render_image(self,
+                     time: QTime,
+                     size: QSize,
+                     pen: QColor,
+                     font: QFont,
+                     dpr: float = 1.0,
+                     background: QColor | None = None) -> QImage:
+        image = QImage(size * dpr, QImage.Format.Format_ARGB32_Premultiplied)
+        image.setDevicePixelRatio(dpr)
+        image.fill(background or Qt.GlobalColor.transparent)
+
+        painter = QPainter(image)
+        self.begin(painter, QRect(QPoint(), size), pen, font)
+        self.draw_face(painter)
+        self.draw_hands(painter, time)
+        painter.end()
+
+        return image
+
+    def _paint_layer(self,
+                     device: QPixmap | QImage,
+                     size: QSize,
+                     dpr: float,
+                     draw: Callable[[QPainter], None],
+                     pen: QColor,
+                     font: QFont):
+        device.setDevicePixelRatio(dpr)
+        device.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(device)
+        self.begin(painter, QRect(QPoint(), size), pen, font)
+        draw(painter)
+        painter.end()
+
+    def draw_face(self, painter: QPainter):
+        self.draw_marks(painter)
+        self.draw_numbers(painter)
+
+    def draw_face_layers(self, painter: QPainter):
+        # Marks and numbers each start from the untouched transform, the
+        # same as when AnalogClock paints them as separate layers.
+        painter.save()
+        self.draw_marks(painter)
+        painter.restore()
+        painter.save()
+        self.draw_numbers(painter)
+        painter.restore()
 
-        if self._settings.show_minute_marks:
-            self._draw_minute_marks(painter)
+    def draw_marks(self, painter: QPainter):
+        if self.settings.show_hour_marks:
+            self.draw_hour_marks(painter)
 
-        if self._settings.hours_text_interval > 0:
-            self._draw_hour_numbers(painter)
+        if self.settings.show_minute_marks:
+            self.draw_minute_marks(painter)
 
-        if self._settings.minutes_text_interval > 0:
-            self._draw_minute_numbers(painter)
+    def draw_numbers(self, painter: QPainter):
+        if self.settings.hours_text_interval > 0:
+            self.draw_hour_numbers(painter)
 
-        self._draw_hour_hand(painter)
-        self._draw_minute_hand(painter)
+        if self.settings.minutes_text_interval > 0:
+            self.draw_minute_numbers(painter)
 
-    def _draw_hour_marks(self, painter: QPainter):
+    def draw_hour_marks(self, painter: QPainter):
         for i in range(12):
             painter.drawLine(70, 0, 80, 0)
             painter.rotate(30)
 
-    def _draw_minute_marks(self, painter: QPainter):
+    def draw_minute_marks(self, painter: QPainter):
         for i in range(60):
             if i % 5 != 0:
                 painter.drawLine(77, 0, 80, 0)
             painter.rotate(6)
 
-    def _draw_hour_numbers(self, painter: QPainter):
-        painter.setPen(self._hour_numbers_color)
+    def draw_hour_numbers(self, painter: QPainter):
+        painter.setPen(self.hour_numbers_color)
         font = painter.font()
         font.setPointSize(10)
         font.setBold(True)
         painter.setFont(font)
         circle_diameter = 60
 
-        for i in range(0, 12, self._settings.hours_text_interval):
+        for i in range(0, 12, self.settings.hours_text_interval):
             angle = math.radians(-30 * i)
             x = circle_diameter * -math.sin(angle)
             y = circle_diameter * -math.cos(angle)
@@ -175,15 +418,15 @@ class AnalogClock(QWidget):
                 i = 12
             painter.drawText(int(x - 5), int(y + 5), str(i))
 
-    def _draw_minute_numbers(self, painter: QPainter):
-        painter.setPen(self._minute_numbers_color)
+    def draw_minute_numbers(self, painter: QPainter):
+        painter.setPen(self.minute_numbers_color)
         font = painter.font()
         font.setPointSize(6)
         font.setBold(True)
         painter.setFont(font)
         circle_diameter = 90
 
-        for i in range(0, 60, self._settings.minutes_text_interval):
+        for i in range(0, 60, self.settings.minutes_text_interval):
             if i % 5 == 0:
                 angle = math.radians(-6 * i)
                 x = circle_diameter * -math.sin(angle)
@@ -196,34 +439,900 @@ class AnalogClock(QWidget):
 
                 painter.drawText(int(x + x_offset), int(y + y_offset), str(i))
 
-    def _draw_hour_hand(self, painter: QPainter):
-        self.hour_hand = QPolygon([
-            QPoint(5, 8),
-            QPoint(-5, 8),
-            QPoint(0, -35)
-        ])
-        painter.setBrush(self._hour_hand_color)
+    def draw_hands(self, painter: QPainter, time: QTime):
+        self.draw_hour_hand(painter, time)
+        self.draw_minute_hand(painter, time)
+
+    def draw_frame(self, painter: QPainter, time: QTime):
+        # Same steps as AnalogClock.paintEvent, so a frame matches a
+        # regular paint of the same time.
+        self.draw_face_layers(painter)
+        self.draw_hands(painter, time)
+
+    def draw_hands_at(self,
+                      painter: QPainter,
+                      hour_angle: float,
+                      minute_angle: float):
+        painter.setPen(Qt.PenStyle.NoPen)
+        hands = (
+            (self.hour_hand, self.hour_hand_color, hour_angle),
+            (self.minute_hand, self.minute_hand_color, minute_angle),
+        )
+
+        for hand, color, angle in hands:
+            painter.setBrush(color)
+            painter.save()
+            painter.rotate(angle)
+            painter.drawConvexPolygon(hand)
+            painter.restore()
+
+    def draw_hour_hand(self, painter: QPainter, time: QTime):
+        painter.setBrush(self.hour_hand_color)
         painter.setPen(Qt.PenStyle.NoPen)
         painter.save()
-        hour_angle = 30 * (self._time.hour() % 12 + self._time.minute() / 60.0)
-        painter.rotate(hour_angle)
+        painter.rotate(self.hour_angle(time))
         painter.drawConvexPolygon(self.hour_hand)
         painter.restore()
 
-    def _draw_minute_hand(self, painter: QPainter):
-        self.minute_hand = QPolygon([
-            QPoint(3, 8),
-            QPoint(-3, 8),
-            QPoint(0, -55)
-        ])
-        painter.setBrush(self._minute_hand_color)
+    def draw_minute_hand(self, painter: QPainter, time: QTime):
+        painter.setBrush(self.minute_hand_color)
         painter.setPen(Qt.PenStyle.NoPen)
         painter.save()
-        minute_angle = 6 * (self._time.minute() + self._time.second() / 60.0)
-        painter.rotate(minute_angle)
+        painter.rotate(self.minute_angle(time))
         painter.drawConvexPolygon(self.minute_hand)
         painter.restore()
 
+    @staticmethod
+    def sprite_bounds(hand: QPolygon) -> QRectF:
+        return QRectF(hand.boundingRect()).adjusted(-1, -1, 1, 1)
+
+    def render_hand_sprite(self,
+                           hand: QPolygon,
+                           color: QColor,
+                           scale: float,
+                           dpr: float) -> QPixmap:
+        bounds = self.sprite_bounds(hand)
+        size = (bounds.size() * scale).toSize() + QSize(1, 1)
+        pixmap = QPixmap(size * dpr)
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.scale(scale, scale)
+        painter.translate(-bounds.left(), -bounds.top())
+        painter.setBrush(color)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawConvexPolygon(hand)
+        painter.end()
+
+        return pixmap
+
+    def draw_hand_sprite(self,
+                         painter: QPainter,
+                         hand: QPolygon,
+                         sprite: QPixmap,
+                         angle: float):
+        painter.save()
+        painter.rotate(angle)
+        painter.drawPixmap(
+            self.sprite_bounds(hand), sprite, QRectF(sprite.rect())
+        )
+        painter.restore()
+
+
+class FaceCache:
+    def __init__(self, capacity: int = 16):
+        self._capacity = capacity
+        self._faces: OrderedDict[tuple, QPixmap] = OrderedDict()
+
+    def get(self, key: tuple, render: Callable[[], QPixmap]) -> QPixmap:
+        face = self._faces.get(key)
+
+        if face is None:
+            face = render()
+            self._faces[key] = face
+
+            if len(self._faces) > self._capacity:
+                self._faces.popitem(last=False)
+
+        else:
+            self._faces.move_to_end(key)
+
+        return face
+
+
+class ClockRenderSignals(QObject):
+    finished = pyqtSignal(int, object)
+
+
+class ClockRenderJob(QRunnable):
+    """Renders clock images in the thread pool.
+
+    Each draw function gets the job's own ClockPainter and a painter set
+    up for an image of the job's geometry. The images are reported by
+    key, in the order of draws.
+    """
+
+    def __init__(self,
+                 generation: int,
+                 settings: AnalogClockSettings,
+                 draws: dict[object, Callable[[ClockPainter, QPainter], None]],
+                 geometry: tuple[int, int, float],
+                 pen: QColor,
+                 font: QFont,
+                 is_current: Callable[[int], bool] | None = None):
+        super().__init__()
+        # The widget keeps the job alive until it reports back.
+        self.setAutoDelete(False)
+        self.signals = ClockRenderSignals()
+        self.generation = generation
+        self.settings = settings
+        self.geometry = geometry
+        self.pen = pen
+        self.font = font
+        self._draws = draws
+        self._is_current = is_current
+
+    def run(self):
+        clock_painter = ClockPainter(self.settings)
+        width, height, dpr = self.geometry
+        images = {}
+
+        for key, draw in self._draws.items():
+            if (self._is_current is not None
+                    and not self._is_current(self.generation)):
+                break
+
+            images[key] = clock_painter.render_layer_image(
+                QSize(width, height), dpr,
+                lambda painter, draw=draw: draw(clock_painter, painter),
+                self.pen, self.font
+            )
+
+        self.signals.finished.emit(self.generation, images)
+
+
+class AnalogClock(QWidget):
+    painted = pyqtSignal()
+    # Emitted whenever what the clock shows changes, for its mirrors.
+    changed = pyqtSignal()
+
+    def __init__(self, time: QTime, parent=None):
+        super().__init__(parent)
+        self._time = time
+        # A whole pre-rendered clock, shown instead of painting the face
+        # and hands until the time or settings change.
+        self._frame: QPixmap | None = None
+        self._frame_jobs: set[ClockRenderJob] = set()
+        self._mirrors: list[QWidget] = []
+        self._shared: tuple[tuple, QPixmap] | None = None
+        self._clock_painter = ClockPainter()
+        self._layers: dict[str, tuple[tuple, QPixmap]] = {}
+        self._face_jobs: dict[int, ClockRenderJob] = {}
+        self._face_generation = 0
+        self.hour_hand = self._clock_painter.hour_hand
+        self.minute_hand = self._clock_painter.minute_hand
+
+        # While animating, the hands are drawn at _dial_position (minutes
+        # since 12:00) instead of at _time.
+        self._dial_position: float | None = None
+        self._sweep = (0.0, 0.0)
+        self._animation = QVariantAnimation(self)
+        self._animation.setStartValue(0.0)
+        self._animation.setEndValue(1.0)
+        self._animation.setDuration(HAND_ANIMATION_MS)
+        self._animation.setEasingCurve(QEasingCurve.Type.InOutCubic)
+        self._animation.valueChanged.connect(self._on_animation_step)
+        self._animation.finished.connect(self._on_animation_finished)
+
+    @property
+    def _settings(self) -> AnalogClockSettings:
+        return self._clock_painter.settings
+
+    def get_current_settings(self):
+        settings = AnalogClockSettings()
+        settings.hours_text_interval = self._settings.hours_text_interval
+        settings.minutes_text_interval = self._settings.minutes_text_interval
+        settings.show_hour_marks = self._settings.show_hour_marks
+        settings.show_minute_marks = self._settings.show_minute_marks
+        return settings
+
+    def set_settings(self, settings: AnalogClockSettings):
+        old_settings = self._settings
+        self._clock_painter.settings = settings
+        changed = False
+
+        if old_settings.marks_key() != settings.marks_key():
+            self._layers.pop("marks", None)
+            changed = True
+
+        if old_settings.numbers_key() != settings.numbers_key():
+            self._layers.pop("numbers", None)
+            changed = True
+
+        if changed:
+            self._frame = None
+            self._redraw()
+
+    def minute_hand_length(self) -> float:
+        side = min(self.width(), self.height())
+        tip = -self.minute_hand.boundingRect().top()
+        return tip * side / 200.0 * self.devicePixelRatioF()
+
+    def set_time(self, time: QTime):
+        if time == self._time and self._dial_position is None:
+            return
+
+        old_region = self._hands_region()
+        self._animation.stop()
+        self._dial_position = None
+        self._time = time
+
+        if self._frame is not None:
+            self._frame = None
+            self._redraw()
+            return
+
+        self._redraw(old_region.united(self._hands_region()))
+
+    def show_frame(self, time: QTime, frame: QPixmap) -> bool:
+        """Swap in a frame from render_frames_async.
+
+        Returns False, leaving the clock unchanged, if the frame was
+        rendered for a different size or scale factor.
+        """
+        if not self._frame_fits(frame):
+            return False
+
+        self._animation.stop()
+        self._dial_position = None
+        self._time = time
+        self._frame = frame
+        self._redraw()
+        return True
+
+    def render_frames_async(self,
+                            times: list[QTime],
+                            done: Callable[[list[QPixmap]], None]):
+        """Render whole clocks for times in the thread pool."""
+        job = ClockRenderJob(
+            0,
+            self.get_current_settings(),
+            {
+                index: lambda clock_painter, painter, time=time:
+                    clock_painter.draw_frame(painter, time)
+                for index, time in enumerate(times)
+            },
+            (self.width(), self.height(), self.devicePixelRatioF()),
+            self._pen_color(),
+            QFont(self.font())
+        )
+        self._frame_jobs.add(job)
+        job.signals.finished.connect(
+            lambda _, images, job=job: self._on_frames_rendered(
+                job, images, done
+            )
+        )
+        QThreadPool.globalInstance().start(job)
+
+    def _on_frames_rendered(self,
+                            job: ClockRenderJob,
+                            images: dict[int, QImage],
+                            done: Callable[[list[QPixmap]], None]):
+        self._frame_jobs.discard(job)
+
+        # Rendered with settings that have changed since.
+        if job.settings.key() != self._settings.key():
+            images = {}
+
+        done([QPixmap.fromImage(image) for image in images.values()])
+
+    def _frame_fits(self, frame: QPixmap) -> bool:
+        return (frame.deviceIndependentSize().toSize() == self.size()
+                and frame.devicePixelRatio() == self.devicePixelRatioF())
+
+    def animate_to(self, time: QTime):
+        start = self._dial_position
+        if start is None:
+            start = self._clock_painter.dial_minutes(self._time)
+
+        # Always sweep forwards, the way the hands of a real clock move.
+        distance = (
+            self._clock_painter.dial_minutes(time) - start
+        ) % MINUTES_PER_DIAL
+
+        if distance == 0 or not self.isVisible():
+            self.set_time(time)
+            return
+
+        self._animation.stop()
+        self._time = time
+        self._frame = None
+        self._sweep = (start, start + distance)
+        self._dial_position = start
+        self._animation.start()
+        self.changed.emit()
+
+    def is_animating(self) -> bool:
+        return self._dial_position is not None
+
+    def _on_animation_step(self, progress: float):
+        if self._dial_position is None:
+            return
+
+        old_region = self._hands_region()
+        start, end = self._sweep
+        self._dial_position = start + (end - start) * progress
+        self._redraw(old_region.united(self._hands_region()))
+
+    def _on_animation_finished(self):
+        old_region = self._hands_region()
+        self._dial_position = None
+        self._redraw(old_region.united(self._hands_region()))
+
+    def _redraw(self, region: QRegion | None = None):
+        if region is None:
+            self.update()
+        else:
+            self.update(region)
+
+        self.changed.emit()
+
+    def add_mirror(self, mirror: QWidget):
+        """Paint from the shared frame while mirror also shows it."""
+        self._mirrors.append(mirror)
+        self.update()
+
+    def remove_mirror(self, mirror: QWidget):
+        self._mirrors.remove(mirror)
+
+        if not self._mirrors:
+            self._shared = None
+            self._layers.pop("shared_face", None)
+
+        self.update()
+
+    def hand_angles(self) -> tuple[float, float]:
+        if self._dial_position is not None:
+            return self._clock_painter.dial_angles(self._dial_position)
+
+        return (
+            self._clock_painter.hour_angle(self._time),
+            self._clock_painter.minute_angle(self._time),
+        )
+
+    def shared_frame(self) -> QPixmap:
+        """The whole clock, rasterized once for this clock and its mirrors.
+
+        The frame is square, at the largest device pixel size any of them
+        shows it at. It is only rendered again when the hands, settings or
+        that size change.
+        """
+        side = max(
+            round(min(view.width(), view.height()) * view.devicePixelRatioF())
+            for view in (self, *self._mirrors)
+        )
+        pen = self._pen_color()
+        font = self.font()
+        face_key = (side, self._settings.key(), pen.rgba(), font.key())
+        key = (face_key, self.hand_angles())
+
+        if self._shared is not None and self._shared[0] == key:
+            return self._shared[1]
+
+        size = QSize(side, side)
+        face = self._layers.get("shared_face")
+
+        if face is None or face[0] != face_key:
+            face = (face_key, self._clock_painter.render_layer(
+                size, 1.0, self._clock_painter.draw_face_layers, pen, font
+            ))
+            self._layers["shared_face"] = face
+
+        frame = face[1].copy()
+        painter = QPainter(frame)
+        self._clock_painter.begin(painter, QRect(QPoint(), size), pen, font)
+        self._clock_painter.draw_hands_at(painter, *key[1])
+        painter.end()
+
+        self._shared = (key, frame)
+        return frame
+
+    def draw_shared_frame(self, painter: QPainter, rect: QRect):
+        frame = self.shared_frame()
+        side = min(rect.width(), rect.height())
+        target = QRectF(0, 0, side, side)
+        target.moveCenter(QRectF(rect).center())
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawPixmap(target, frame, QRectF(frame.rect()))
+        painter.restore()
+
+    def paintEvent(self, a0):
+        self._paint(a0.region())
+        self.painted.emit()
+
+    def _paint(self, exposed: QRegion):
+        painter = QPainter(self)
+        painter.setClipRegion(exposed)
+
+        if self._frame is not None and self._frame_fits(self._frame):
+            painter.drawPixmap(0, 0, self._frame)
+            return
+
+        self._frame = None
+
+        if self._mirrors:
+            self.draw_shared_frame(painter, self.rect())
+            return
+
+        self._paint_face(painter)
+
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self._clock_painter.transform(painter, self.rect())
+
+        if self._dial_position is not None:
+            self._paint_hand_sprites(painter, exposed)
+            return
+
+        hour_rect, minute_rect = self._clock_painter.hand_rects(
+            self._time, self.rect()
+        )
+
+        if exposed.intersects(hour_rect):
+            self._clock_painter.draw_hour_hand(painter, self._time)
+
+        if exposed.intersects(minute_rect):
+            self._clock_painter.draw_minute_hand(painter, self._time)
+
+    def _paint_hand_sprites(self, painter: QPainter, exposed: QRegion):
+        clock_painter = self._clock_painter
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        angles = clock_painter.dial_angles(self._dial_position)
+        rects = clock_painter.angle_rects(*angles, self.rect())
+        hands = (
+            (self.hour_hand, clock_painter.hour_hand_color),
+            (self.minute_hand, clock_painter.minute_hand_color),
+        )
+
+        for (hand, color), angle, rect in zip(hands, angles, rects):
+            if exposed.intersects(rect):
+                clock_painter.draw_hand_sprite(
+                    painter, hand, self._hand_sprite(hand, color), angle
+                )
+
+    def _hand_sprite(self, hand: QPolygon, color: QColor) -> QPixmap:
+        scale = min(self.width(), self.height()) / 200.0
+        dpr = self.devicePixelRatioF()
+        name = "hour_hand" if hand is self.hour_hand else "minute_hand"
+        key = (scale, dpr, color.rgba())
+        cached = self._layers.get(name)
+
+        if cached is None or cached[0] != key:
+            sprite = self._clock_painter.render_hand_sprite(
+                hand, color, scale, dpr
+            )
+            cached = (key, sprite)
+            self._layers[name] = cached
+
+        return cached[1]
+
+    def _hands_region(self) -> QRegion:
+        if self._dial_position is not None:
+            return self._clock_painter.angles_region(
+                *self._clock_painter.dial_angles(self._dial_position),
+                self.rect()
+            )
+
+        return self._clock_painter.hands_region(self._time, self.rect())
+
+    @staticmethod
+    def _face_keys(settings: AnalogClockSettings,
+                   pen: QColor,
+                   font: QFont) -> dict[str, tuple]:
+        """What each face layer looks like, apart from its geometry."""
+        return {
+            "marks": (settings.marks_key(), pen.rgba(), font.key()),
+            "numbers": (settings.numbers_key(), pen.rgba(), font.key()),
+        }
+
+    def _paint_face(self, painter: QPainter):
+        geometry = (self.width(), self.height(), self.devicePixelRatioF())
+        layers = self._face_keys(
+            self._settings, self._pen_color(), self.font()
+        )
+        stale = []
+
+        for name, face_key in layers.items():
+            cached = self._layers.get(name)
+
+            if cached is not None and cached[0] == (geometry, face_key):
+                painter.drawPixmap(0, 0, cached[1])
+
+            elif cached is not None and cached[0][1] == face_key:
+                # Only the size or scale factor changed: show the last face
+                # scaled while a sharp one is rendered in the background.
+                self._draw_scaled(painter, cached[0][0], cached[1])
+                stale.append(name)
+
+            else:
+                layer = self._clock_painter.render_layer(
+                    self.size(), geometry[2], getattr(
+                        self._clock_painter, f"draw_{name}"
+                    ), self._pen_color(), self.font()
+                )
+                self._layers[name] = ((geometry, face_key), layer)
+                painter.drawPixmap(0, 0, layer)
+
+        if stale:
+            self._render_face_async(geometry, stale)
+
+    def _draw_scaled(self,
+                     painter: QPainter,
+                     geometry: tuple[int, int, float],
+                     layer: QPixmap):
+        width, height, _ = geometry
+        scale = (min(self.width(), self.height()) / min(width, height)
+                 if min(width, height) > 0 else 1.0)
+        target = QRectF(0, 0, width * scale, height * scale)
+        target.moveCenter(QRectF(self.rect()).center())
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawPixmap(target, layer, QRectF(layer.rect()))
+        painter.restore()
+
+    def _render_face_async(self,
+                           geometry: tuple[int, int, float],
+                           layers: list[str]):
+        pool = QThreadPool.globalInstance()
+        current = self._face_jobs.get(self._face_generation)
+
+        if current is not None:
+            if current.geometry == geometry:
+                return
+
+            if pool.tryTake(current):
+                del self._face_jobs[self._face_generation]
+
+        self._face_generation += 1
+        job = ClockRenderJob(
+            self._face_generation,
+            self.get_current_settings(),
+            {name: getattr(ClockPainter, f"draw_{name}") for name in layers},
+            geometry,
+            self._pen_color(),
+            QFont(self.font()),
+            self._is_current_face_job
+        )
+        job.signals.finished.connect(self._on_face_rendered)
+        self._face_jobs[self._face_generation] = job
+        pool.start(job)
+
+    def _is_current_face_job(self, generation: int) -> bool:
+        return generation == self._face_generation
+
+    def _on_face_rendered(self, generation: int, images: dict[str, QImage]):
+        job = self._face_jobs.pop(generation)
+        if generation != self._face_generation:
+            return
+
+        current_keys = self._face_keys(
+            self._settings, self._pen_color(), self.font()
+        )
+        rendered_keys = self._face_keys(job.settings, job.pen, job.font)
+
+        for name, image in images.items():
+            face_key = rendered_keys[name]
+
+            # Rendered with settings, colors or a font that have changed
+            # since.
+            if face_key != current_keys[name]:
+                continue
+
+            self._layers[name] = (
+                (job.geometry, face_key), QPixmap.fromImage(image)
+            )
+
+        self.update()
+
+    def _pen_color(self) -> QColor:
+        return self.palette().color(QPalette.ColorRole.WindowText)
+
+    def render_image(self,
+                     size: QSize,
+                     dpr: float = 1.0,
+                     background: QColor | None = None) -> QImage:
+        return self._clock_painter.render_image(
+            self._time, size, self._pen_color(), self.font(), dpr, background
+        )
+
+
+class MirrorWindow(QWidget):
+    """Shows the main clock alone, e.g. full screen on a projector.
+
+    It draws the source clock's shared frame scaled to its own size, and
+    only repaints when the source changes.
+    """
+
+    def __init__(self, source: AnalogClock, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Analog Clock")
+        self.resize(800, 800)
+        # Closing the main window should still quit with this one open.
+        self.setAttribute(Qt.WidgetAttribute.WA_QuitOnClose, False)
+        self._source = source
+        source.changed.connect(self.update)
+
+    def showEvent(self, a0):
+        self._source.add_mirror(self)
+        super().showEvent(a0)
+
+    def hideEvent(self, a0):
+        self._source.remove_mirror(self)
+        super().hideEvent(a0)
+
+    def paintEvent(self, a0):
+        painter = QPainter(self)
+        painter.setClipRegion(a0.region())
+        self._source.draw_shared_frame(painter, self.rect())
+
+    def mouseDoubleClickEvent(self, a0):
+        self.toggle_full_screen()
+
+    def keyPressEvent(self, a0):
+        if a0.key() == Qt.Key.Key_F11:
+            self.toggle_full_screen()
+
+        elif a0.key() == Qt.Key.Key_Escape and self.isFullScreen():
+            self.showNormal()
+
+        else:
+            super().keyPressEvent(a0)
+
+    def toggle_full_screen(self):
+        if self.isFullScreen():
+            self.showNormal()
+        else:
+            self.showFullScreen()
+
+
+class ClockBoard(QWidget):
+    check_requested = pyqtSignal(int)
+
+    INPUT_HEIGHT = 32
+    SPACING = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._clock_painter = ClockPainter()
+        self._faces = FaceCache()
+        self._times: list[QTime] = []
+        self._clock_rects: list[QRect] = []
+        self.inputs: list[TimeInput] = []
+
+    def set_settings(self, settings: AnalogClockSettings):
+        if settings.key() != self._clock_painter.settings.key():
+            self._clock_painter.settings = settings
+            self.update()
+
+    def set_times(self, times: list[QTime]):
+        if len(times) != len(self._times):
+            self._resize_cells(len(times))
+            self._times = list(times)
+            self.update()
+            return
+
+        for index, time in enumerate(times):
+            self.set_time(index, time)
+
+    def set_time(self, index: int, time: QTime):
+        old_time = self._times[index]
+        if old_time == time:
+            return
+
+        rect = self._clock_rects[index]
+        self._times[index] = time
+        self.update(
+            self._clock_painter.hands_region(old_time, rect).united(
+                self._clock_painter.hands_region(time, rect)
+            )
+        )
+
+    def time(self, index: int) -> QTime:
+        return self._times[index]
+
+    def _resize_cells(self, count: int):
+        while len(self.inputs) > count:
+            time_input = self.inputs.pop()
+            time_input.hide()
+            time_input.deleteLater()
+
+        while len(self.inputs) < count:
+            index = len(self.inputs)
+            time_input = TimeInput(self, compact=True)
+            time_input.check_button.clicked.connect(
+                lambda _=False, i=index: self.check_requested.emit(i)
+            )
+            time_input.hours_return_pressed().connect(
+                lambda i=index: self.check_requested.emit(i)
+            )
+            time_input.minutes_return_pressed().connect(
+                lambda i=index: self.check_requested.emit(i)
+            )
+            time_input.show()
+            self.inputs.append(time_input)
+
+        self._layout_cells(count)
+
+    def _layout_cells(self, count: int):
+        self._clock_rects = []
+        if count == 0:
+            return
+
+        columns = math.ceil(math.sqrt(count * self.width() /
+                                      max(1, self.height())))
+        columns = max(1, min(count, columns))
+        rows = math.ceil(count / columns)
+        cell_width = self.width() // columns
+        cell_height = self.height() // rows
+
+        for index in range(count):
+            row, column = divmod(index, columns)
+            cell = QRect(column * cell_width, row * cell_height,
+                         cell_width, cell_height)
+            cell = cell.adjusted(self.SPACING, self.SPACING,
+                                 -self.SPACING, -self.SPACING)
+            clock_rect = cell.adjusted(0, 0, 0, -self.INPUT_HEIGHT)
+            self._clock_rects.append(clock_rect)
+            self.inputs[index].setGeometry(
+                cell.left(), clock_rect.bottom() + 1,
+                cell.width(), self.INPUT_HEIGHT
+            )
+
+    def resizeEvent(self, a0):
+        self._layout_cells(len(self._times))
+        super().resizeEvent(a0)
+
+    def paintEvent(self, a0):
+        if not self._clock_rects:
+            return
+
+        exposed = a0.region()
+        painter = QPainter(self)
+        painter.setClipRegion(exposed)
+        face = self._face(self._clock_rects[0].size())
+
+        for time, rect in zip(self._times, self._clock_rects):
+            if not exposed.intersects(rect):
+                continue
+
+            painter.drawPixmap(rect.topLeft(), face)
+            painter.save()
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            self._clock_painter.transform(painter, rect)
+            self._clock_painter.draw_hands(painter, time)
+            painter.restore()
+
+    def _face(self, size: QSize) -> QPixmap:
+        dpr = self.devicePixelRatioF()
+        key = (size.width(), size.height(), dpr,
+               self._clock_painter.settings.key())
+        pen = self.palette().color(QPalette.ColorRole.WindowText)
+        return self._faces.get(key, lambda: self._clock_painter.render_layer(
+            size, dpr, self._clock_painter.draw_face, pen, self.font()
+        ))
+
+
+class ClockBoardWindow(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Clock Board")
+        self.resize(1000, 800)
+
+        layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(QLabel("Clocks", self))
+        self.count_dropdown = QComboBox(self)
+        for count in (12, 20, 30, 48, 100):
+            self.count_dropdown.addItem(str(count), count)
+        top_layout.addWidget(self.count_dropdown)
+        top_layout.addStretch()
+        self.new_times_button = QPushButton("New Times", self)
+        top_layout.addWidget(self.new_times_button)
+        layout.addLayout(top_layout)
+
+        self.board = ClockBoard(self)
+        layout.addWidget(self.board)
+
+    def clock_count(self) -> int:
+        return self.count_dropdown.currentData()
+
+
+class DigitalClockFace(QWidget):
+    HOUR_TEXTS = tuple(f"{hour or 12:02}" for hour in range(12))
+    MINUTE_TEXTS = tuple(f"{minute:02}" for minute in range(60))
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._hour = 0
+        self._minute = 0
+        self._hour_color = QColor("red")
+        self._minute_color = QColor("teal")
+        # Prepared text by string, valid for _texts_key (font, DPR).
+        self._texts: dict[str, QStaticText] = {}
+        self._texts_key: tuple | None = None
+        self.setFont(self.display_font(self.font()))
+
+    @staticmethod
+    def display_font(font: QFont) -> QFont:
+        font = QFont(font)
+        font.setPixelSize(64)
+        font.setBold(True)
+        return font
+
+    def set_time(self, hour: int, minute: int):
+        hour %= 12
+        if (hour, minute) != (self._hour, self._minute):
+            self._hour = hour
+            self._minute = minute
+            self.update()
+
+    def sizeHint(self) -> QSize:
+        metrics = QFontMetrics(self.font())
+        return QSize(metrics.horizontalAdvance("00:00"), metrics.height())
+
+    def changeEvent(self, a0):
+        if a0.type() == a0.Type.FontChange:
+            self._texts.clear()
+            self.updateGeometry()
+
+        super().changeEvent(a0)
+
+    def paintEvent(self, a0):
+        hours = self._static_text(self.HOUR_TEXTS[self._hour])
+        colon = self._static_text(":")
+        minutes = self._static_text(self.MINUTE_TEXTS[self._minute])
+
+        hours_width = hours.size().width()
+        colon_width = colon.size().width()
+        width = hours_width + colon_width + minutes.size().width()
+        x = (self.width() - width) / 2
+        y = (self.height() - hours.size().height()) / 2
+
+        painter = QPainter(self)
+        painter.setFont(self.font())
+        painter.setPen(self._hour_color)
+        painter.drawStaticText(QPointF(x, y), hours)
+        painter.setPen(self.palette().color(QPalette.ColorRole.WindowText))
+        painter.drawStaticText(QPointF(x + hours_width, y), colon)
+        painter.setPen(self._minute_color)
+        painter.drawStaticText(
+            QPointF(x + hours_width + colon_width, y), minutes
+        )
+
+    def _static_text(self, text: str) -> QStaticText:
+        key = (self.font().key(), self.devicePixelRatioF())
+        if key != self._texts_key:
+            self._texts.clear()
+            self._texts_key = key
+
+        static_text = self._texts.get(text)
+
+        if static_text is None:
+            static_text = QStaticText(text)
+            static_text.setTextFormat(Qt.TextFormat.PlainText)
+            static_text.setPerformanceHint(
+                QStaticText.PerformanceHint.AggressiveCaching
+            )
+            static_text.prepare(QTransform(), self.font())
+            self._texts[text] = static_text
+
+        return static_text
+
 
 class DigitalClock(QStackedWidget):
     def __init__(self, time: QTime, parent=None):
@@ -234,55 +1343,68 @@ class DigitalClock(QStackedWidget):
             QSizePolicy.Policy.Fixed
         )
 
-        self._digital_clock = QLabel(self)
-        self._digital_clock.setStyleSheet("font-size: 64px; font: bold;")
-        self._digital_clock.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        # Built on first show, as most sessions never reveal the answer.
+        self._digital_clock: DigitalClockFace | None = None
 
         self._empty_widget = QWidget(self)
-        self.addWidget(self._digital_clock)
         self.addWidget(self._empty_widget)
 
-        self._set_text()
+    def sizeHint(self) -> QSize:
+        if self._digital_clock is not None:
+            return self._digital_clock.sizeHint()
+
+        metrics = QFontMetrics(DigitalClockFace.display_font(self.font()))
+        return QSize(metrics.horizontalAdvance("00:00"), metrics.height())
 
     def set_time(self, time: QTime):
         self._time = time
         self._set_text()
 
     def _set_text(self):
-        hour_number = self._time.hour() % 12
-
-        if hour_number == 0:
-            hour_number = 12
-
-        hours = self._text_style(str(hour_number).zfill(2), "red")
-        minutes = self._text_style(self._time.toString("mm"), "teal")
-
-        self._digital_clock.setText(f"{hours}:{minutes}")
-
-    def _text_style(self, text: str, color: str) -> str:
-        return (
-            f'<span style="color: {color};">{text}</span>'
-        )
+        if self._digital_clock is not None:
+            self._digital_clock.set_time(
+                self._time.hour(), self._time.minute()
+            )
 
     def show_clock(self):
+        if self._digital_clock is None:
+            self._digital_clock = DigitalClockFace(self)
+            self.addWidget(self._digital_clock)
+            self._set_text()
+
         self.setCurrentWidget(self._digital_clock)
 
     def hide_clock(self):
         self.setCurrentWidget(self._empty_widget)
 
 
+class ValidationState(Enum):
+    NEUTRAL = "neutral"
+    CORRECT = "correct"
+    WRONG = "wrong"
+
+
 class TimeInput(QWidget):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, compact: bool = False):
         super().__init__(parent)
 
         layout = QHBoxLayout(self)
+        if compact:
+            layout.setContentsMargins(0, 0, 0, 0)
+
         self.setStyleSheet(
             """
             QLineEdit {
-                font-size: 32px;
+                font-size: %dpx;
                 font: bold;
             }
-            """
+            QLineEdit[validation="correct"] {
+                background-color: green;
+            }
+            QLineEdit[validation="wrong"] {
+                background-color: red;
+            }
+            """ % (16 if compact else 32)
         )
         self.setSizePolicy(
             QSizePolicy.Policy.Expanding,
@@ -301,35 +1423,64 @@ class TimeInput(QWidget):
         self._minutes.setPlaceholderText("MM")
         layout.addWidget(self._minutes)
 
+        for field in (self._hours, self._minutes):
+            field.setProperty("validation", ValidationState.NEUTRAL.value)
+
         self.check_button = QPushButton("Check", self)
-        self.check_button.setFixedWidth(200)
+        self.check_button.setFixedWidth(60 if compact else 200)
         layout.addWidget(self.check_button)
 
     def hours(self):
-        self._hours.setStyleSheet("")
         return self._hours.text()
 
     def minutes(self):
-        self._minutes.setStyleSheet("")
         return self._minutes.text()
 
+    def set_hours_state(self, state: ValidationState):
+        self._set_state(self._hours, state)
+
+    def set_minutes_state(self, state: ValidationState):
+        self._set_state(self._minutes, state)
+
+    def hours_state(self) -> ValidationState:
+        return ValidationState(self._hours.property("validation"))
+
+    def minutes_state(self) -> ValidationState:
+        return ValidationState(self._minutes.property("validation"))
+
     def set_hours_wrong(self):
-        self._hours.setStyleSheet("background-color: red;")
+        self.set_hours_state(ValidationState.WRONG)
 
     def set_minutes_wrong(self):
-        self._minutes.setStyleSheet("background-color: red;")
+        self.set_minutes_state(ValidationState.WRONG)
 
     def set_hours_correct(self):
-        self._hours.setStyleSheet("background-color: green;")
+        self.set_hours_state(ValidationState.CORRECT)
 
     def set_minutes_correct(self):
-        self._minutes.setStyleSheet("background-color: green;")
+        self.set_minutes_state(ValidationState.CORRECT)
 
     def reset(self):
         self._hours.clear()
         self._minutes.clear()
-        self._hours.setStyleSheet("")
-        self._minutes.setStyleSheet("")
+        self.set_hours_state(ValidationState.NEUTRAL)
+        self.set_minutes_state(ValidationState.NEUTRAL)
+
+    def _set_state(self, field: QLineEdit, state: ValidationState):
+        if field.property("validation") == state.value:
+            return
+
+        # The sheet is parsed once; re-polishing only re-matches its rules
+        # against the new property value.
+        field.setProperty("validation", state.value)
+        field.style().unpolish(field)
+        field.style().polish(field)
+
+    def set_hours(self, text: str):
+        self._hours.setText(text)
+
+    def set_minutes(self, text: str):
+        self._minutes.setText(text)
 
     def hours_return_pressed(self):
         return self._hours.returnPressed
@@ -337,6 +1488,12 @@ class TimeInput(QWidget):
     def minutes_return_pressed(self):
         return self._minutes.returnPressed
 
+    def hours_edited(self):
+        return self._hours.textEdited
+
+    def minutes_edited(self):
+        return self._minutes.textEdited
+
 
 class SettingsWindow(QDialog):
     def __init__(self, parent=None):
@@ -415,6 +1572,16 @@ class SettingsWindow(QDialog):
             parent=behavior_layout
         )
 
+        self.avoid_repeats_checkbox = QCheckBox(
+            "Don't repeat times until all were shown", self
+        )
+        behavior_layout.addWidget(self.avoid_repeats_checkbox)
+
+        self.animate_hands_checkbox = QCheckBox(
+            "Animate hands to new times", self
+        )
+        behavior_layout.addWidget(self.animate_hands_checkbox)
+
         main_layout.addWidget(behavior_group)
 
         bottom_layout = QHBoxLayout()